@@ -6,15 +6,32 @@ with dot notation and environment variable overrides.
 """
 
 import os
+import copy
 import yaml
 import configparser
 import logging
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict, Optional
 
 
 logger = logging.getLogger(__name__)
 
+# libyaml-backed safe loader when PyYAML was built with it (much faster to parse)
+_YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+
+@lru_cache(maxsize=32)
+def _parse_yaml_file(path: str, mtime_ns: int, size: int) -> Any:
+    """
+    Parse a YAML file, memoized per process.
+
+    The modification time and size are part of the cache key, so an edited
+    file is re-parsed on the next load. Callers must not mutate the result.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        return yaml.load(f, Loader=_YAML_LOADER)
+
 
 class ConfigManager:
     """
@@ -66,11 +83,12 @@ class ConfigManager:
                 continue
 
             try:
-                with open(path, 'r', encoding='utf-8') as f:
-                    data = yaml.safe_load(f)
-                    if data:
-                        self.config_data[name] = data
-                        logger.debug(f"Loaded {name} config from {path}")
+                stat = path.stat()
+                data = _parse_yaml_file(str(path), stat.st_mtime_ns, stat.st_size)
+                if data:
+                    # Each instance gets its own copy of the shared parsed data
+                    self.config_data[name] = copy.deepcopy(data)
+                    logger.debug(f"Loaded {name} config from {path}")
             except Exception as e:
                 logger.error(f"Failed to load {path}: {e}")
                 raise
@@ -6,7 +6,9 @@ needed for risk scoring.
 """
 
 import logging
-from typing import Dict, Any, Optional
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Any, Optional
 from datetime import datetime
 
 from src.config.config_manager import ConfigManager
@@ -17,6 +19,77 @@ from src.data.shiller import ShillerDataClient
 
 logger = logging.getLogger(__name__)
 
+# FRED-backed indicators per category: (indicator key, series ID, lookup, lookup kwargs)
+# Lookups: 'latest' value, 'moving_average', 'velocity' (rate of change) and
+# 'previous' value (for detecting crosses). Non-FRED indicators are added by
+# the category fetchers.
+FRED_INDICATOR_SPECS = {
+    'recession': [
+        # Unemployment claims velocity (YoY % change)
+        ('unemployment_claims', 'ICSA', 'latest', {}),
+        ('unemployment_claims_4wk_avg', 'ICSA', 'moving_average', {'window': 4}),
+        ('unemployment_claims_velocity_yoy', 'ICSA', 'velocity', {'method': 'yoy_pct'}),
+        # ISM PMI (regime shift indicator)
+        # Note: NAPM discontinued, using manufacturing employment as proxy
+        ('ism_pmi', 'MANEMP', 'latest', {}),
+        ('ism_pmi_prev', 'MANEMP', 'previous', {}),
+        # Yield curves
+        ('yield_curve_10y2y', 'T10Y2Y', 'latest', {}),
+        ('yield_curve_10y3m', 'T10Y3M', 'latest', {}),
+        # Consumer sentiment
+        ('consumer_sentiment', 'UMCSENT', 'latest', {}),
+        # Unemployment rate (lagging, but useful)
+        ('unemployment_rate', 'UNRATE', 'latest', {}),
+    ],
+    'credit': [
+        # High-yield spreads (velocity + level)
+        ('hy_spread', 'BAMLH0A0HYM2', 'latest', {}),
+        ('hy_spread_velocity_20d', 'BAMLH0A0HYM2', 'velocity', {'method': 'rate', 'lookback_days': 20}),
+        # Investment grade spreads
+        ('ig_spread_bbb', 'BAMLC0A4CBBB', 'latest', {}),
+        # TED spread (LIBOR - Treasury)
+        ('ted_spread', 'TEDRATE', 'latest', {}),
+        # Bank lending standards (quarterly, may be stale)
+        ('bank_lending_standards', 'DRTSCILM', 'latest', {}),
+    ],
+    'valuation': [
+        # Market prices (use FRED instead of Yahoo Finance to avoid rate limits)
+        ('sp500_price', 'SP500', 'latest', {}),
+        # Buffett indicator (Market Cap / GDP)
+        # Note: Wilshire 5000 discontinued from FRED, using S&P 500 level as simpler proxy
+        # For proper Buffett indicator, would need: (Wilshire 5000 / GDP) * 100
+        ('sp500_level', 'SP500', 'latest', {}),
+        # Denominator: GDP (quarterly, may be stale)
+        ('gdp', 'GDP', 'latest', {}),
+        # Housing indicators (for Signal #5: Housing Bubble)
+        ('new_home_sales', 'HSN1F', 'latest', {}),  # New One Family Houses Sold
+        ('mortgage_rate_30y', 'MORTGAGE30US', 'latest', {}),  # 30-Year Fixed Rate
+        ('median_home_price', 'MSPUS', 'latest', {}),  # Median Sales Price
+    ],
+    'liquidity': [
+        # Fed funds rate
+        ('fed_funds_rate', 'DFF', 'latest', {}),
+        ('fed_funds_velocity_6m', 'DFF', 'velocity', {'method': 'pct_change', 'lookback_days': 180}),
+        # CPI inflation (for real interest rate calculation)
+        ('cpi_inflation', 'CPIAUCSL', 'latest', {}),
+        ('cpi_inflation_yoy', 'CPIAUCSL', 'velocity', {'method': 'yoy_pct'}),
+        # M2 money supply
+        ('m2_money_supply', 'M2SL', 'latest', {}),
+        ('m2_velocity_yoy', 'M2SL', 'velocity', {'method': 'yoy_pct'}),
+        # Fed balance sheet
+        ('fed_balance_sheet', 'WALCL', 'latest', {}),
+        # VIX (market volatility) - use FRED to avoid Yahoo Finance rate limits
+        ('vix', 'VIXCLS', 'latest', {}),
+        # Dollar liquidity indicators (Signal #7)
+        ('dollar_index', 'DTWEXBGS', 'latest', {}),  # Trade-weighted dollar index
+        ('fed_swap_lines', 'ROWSLAQ027S', 'latest', {}),  # Fed foreign currency swap lines
+    ],
+    'positioning': [
+        # For now, use VIX as a proxy for complacency (FRED instead of Yahoo)
+        ('vix_proxy', 'VIXCLS', 'latest', {}),
+    ],
+}
+
 
 class DataManager:
     """
@@ -60,22 +133,31 @@ class DataManager:
             }
         """
         logger.info("Fetching all indicators...")
-        start_time = datetime.now()
-
-        data = {
-            'recession': self._fetch_recession_indicators(),
-            'credit': self._fetch_credit_indicators(),
-            'valuation': self._fetch_valuation_indicators(),
-            'liquidity': self._fetch_liquidity_indicators(),
-            'positioning': self._fetch_positioning_indicators(),
-            'metadata': {
-                'fetch_timestamp': datetime.now().isoformat(),
-                'fetch_duration_seconds': 0  # Will update at end
-            }
+        start_time = time.perf_counter()
+
+        # Pull every FRED series in one batch up front so the categories'
+        # per-indicator lookups are all served from the client's cache
+        self._prefetch_series(list(dict.fromkeys(
+            series_id
+            for specs in FRED_INDICATOR_SPECS.values()
+            for _, series_id, _, _ in specs
+        )))
+
+        data = self._fetch_categories({
+            'recession': self._fetch_recession_indicators,
+            'credit': self._fetch_credit_indicators,
+            'valuation': self._fetch_valuation_indicators,
+            'liquidity': self._fetch_liquidity_indicators,
+            'positioning': self._fetch_positioning_indicators,
+        })
+
+        data['metadata'] = {
+            'fetch_timestamp': datetime.now().isoformat(),
+            'fetch_duration_seconds': 0  # Will update at end
         }
 
         # Calculate fetch duration
-        duration = (datetime.now() - start_time).total_seconds()
+        duration = time.perf_counter() - start_time
         data['metadata']['fetch_duration_seconds'] = duration
 
         logger.info(f"Fetch completed in {duration:.1f} seconds")
@@ -96,134 +178,79 @@ class DataManager:
             Dict with all indicator data, organized by category
         """
         logger.info(f"Fetching all indicators as of {as_of_date}...")
-        start_time = datetime.now()
-
-        data = {
-            'recession': self._fetch_recession_indicators_as_of(as_of_date),
-            'credit': self._fetch_credit_indicators_as_of(as_of_date),
-            'valuation': self._fetch_valuation_indicators_as_of(as_of_date),
-            'liquidity': self._fetch_liquidity_indicators_as_of(as_of_date),
-            'positioning': self._fetch_positioning_indicators_as_of(as_of_date),
-            'metadata': {
-                'fetch_timestamp': datetime.now().isoformat(),
-                'as_of_date': as_of_date,
-                'fetch_duration_seconds': 0
-            }
+        start_time = time.perf_counter()
+
+        data = self._fetch_categories({
+            'recession': lambda: self._fetch_recession_indicators_as_of(as_of_date),
+            'credit': lambda: self._fetch_credit_indicators_as_of(as_of_date),
+            'valuation': lambda: self._fetch_valuation_indicators_as_of(as_of_date),
+            'liquidity': lambda: self._fetch_liquidity_indicators_as_of(as_of_date),
+            'positioning': lambda: self._fetch_positioning_indicators_as_of(as_of_date),
+        })
+        data['metadata'] = {
+            'fetch_timestamp': datetime.now().isoformat(),
+            'as_of_date': as_of_date,
+            'fetch_duration_seconds': 0
         }
 
         # Calculate fetch duration
-        duration = (datetime.now() - start_time).total_seconds()
+        duration = time.perf_counter() - start_time
         data['metadata']['fetch_duration_seconds'] = duration
 
         logger.info(f"Fetch completed in {duration:.1f} seconds")
 
         return data
 
-    def _fetch_recession_indicators(self) -> Dict[str, Any]:
-        """Fetch recession risk indicators."""
-        logger.info("Fetching recession indicators...")
-
-        return {
-            # Unemployment claims velocity (YoY % change)
-            'unemployment_claims': self.fred_client.get_latest_value('ICSA'),
-            'unemployment_claims_4wk_avg': self.fred_client.get_moving_average('ICSA', window=4),
-            'unemployment_claims_velocity_yoy': self.fred_client.calculate_velocity('ICSA', method='yoy_pct'),
+    def _fetch_categories(self, fetchers: Dict[str, Callable[[], Dict[str, Any]]]) -> Dict[str, Any]:
+        """
+        Run the per-category fetchers concurrently.
 
-            # ISM PMI (regime shift indicator)
-            # Note: NAPM discontinued, using manufacturing employment as proxy
-            'ism_pmi': self.fred_client.get_latest_value('MANEMP'),
-            'ism_pmi_prev': self._get_previous_value('MANEMP'),  # For detecting crosses
+        Categories are independent and I/O bound, so wall time is set by the
+        slowest category rather than the sum. The FRED client's rate limiter
+        still caps the request rate across threads.
 
-            # Yield curves
-            'yield_curve_10y2y': self.fred_client.get_latest_value('T10Y2Y'),
-            'yield_curve_10y3m': self.fred_client.get_latest_value('T10Y3M'),
+        Args:
+            fetchers: Category name -> zero-argument fetch function
 
-            # Consumer sentiment
-            'consumer_sentiment': self.fred_client.get_latest_value('UMCSENT'),
+        Returns:
+            Dict of category name -> indicator dict, in the order given
+        """
+        with ThreadPoolExecutor(max_workers=len(fetchers)) as executor:
+            futures = {category: executor.submit(fetch) for category, fetch in fetchers.items()}
+            return {category: future.result() for category, future in futures.items()}
 
-            # Unemployment rate (lagging, but useful)
-            'unemployment_rate': self.fred_client.get_latest_value('UNRATE'),
-        }
+    def _fetch_recession_indicators(self) -> Dict[str, Any]:
+        """Fetch recession risk indicators."""
+        logger.info("Fetching recession indicators...")
+        return self._fetch_fred_indicators('recession')
 
     def _fetch_credit_indicators(self) -> Dict[str, Any]:
         """Fetch credit stress indicators."""
         logger.info("Fetching credit indicators...")
-
-        return {
-            # High-yield spreads (velocity + level)
-            'hy_spread': self.fred_client.get_latest_value('BAMLH0A0HYM2'),
-            'hy_spread_velocity_20d': self.fred_client.calculate_velocity(
-                'BAMLH0A0HYM2', method='rate', lookback_days=20
-            ),
-
-            # Investment grade spreads
-            'ig_spread_bbb': self.fred_client.get_latest_value('BAMLC0A4CBBB'),
-
-            # TED spread (LIBOR - Treasury)
-            'ted_spread': self.fred_client.get_latest_value('TEDRATE'),
-
-            # Bank lending standards (quarterly, may be stale)
-            'bank_lending_standards': self.fred_client.get_latest_value('DRTSCILM'),
-        }
+        return self._fetch_fred_indicators('credit')
 
     def _fetch_valuation_indicators(self) -> Dict[str, Any]:
         """Fetch valuation indicators."""
         logger.info("Fetching valuation indicators...")
+        data = self._fetch_fred_indicators('valuation')
 
-        return {
-            # Market prices (use FRED instead of Yahoo Finance to avoid rate limits)
-            'sp500_price': self.fred_client.get_latest_value('SP500'),
-            'sp500_forward_pe': self.market_client.get_forward_pe('^GSPC'),  # Keep trying Yahoo
-
-            # Shiller CAPE (Cyclically Adjusted PE Ratio)
-            'shiller_cape': self.shiller_client.get_latest_cape(),
-
-            # Buffett indicator (Market Cap / GDP)
-            # Note: Wilshire 5000 discontinued from FRED, using S&P 500 as proxy
-            # For proper Buffett indicator, would need: (Wilshire 5000 / GDP) * 100
-            # Using S&P 500 level as simpler proxy for now
-            'sp500_level': self.fred_client.get_latest_value('SP500'),
-            # Denominator: GDP (quarterly, may be stale)
-            'gdp': self.fred_client.get_latest_value('GDP'),
-
-            # Housing indicators (for Signal #5: Housing Bubble)
-            'new_home_sales': self.fred_client.get_latest_value('HSN1F'),  # New One Family Houses Sold
-            'mortgage_rate_30y': self.fred_client.get_latest_value('MORTGAGE30US'),  # 30-Year Fixed Rate
-            'median_home_price': self.fred_client.get_latest_value('MSPUS'),  # Median Sales Price
-        }
+        # Forward P/E: keep trying Yahoo (not available on FRED)
+        data['sp500_forward_pe'] = self.market_client.get_forward_pe('^GSPC')
+
+        # Shiller CAPE (Cyclically Adjusted PE Ratio)
+        data['shiller_cape'] = self.shiller_client.get_latest_cape()
+
+        return data
 
     def _fetch_liquidity_indicators(self) -> Dict[str, Any]:
         """Fetch liquidity condition indicators."""
         logger.info("Fetching liquidity indicators...")
+        data = self._fetch_fred_indicators('liquidity')
 
-        return {
-            # Fed funds rate
-            'fed_funds_rate': self.fred_client.get_latest_value('DFF'),
-            'fed_funds_velocity_6m': self.fred_client.calculate_velocity(
-                'DFF', method='pct_change', lookback_days=180
-            ),
-
-            # CPI inflation (for real interest rate calculation)
-            'cpi_inflation': self.fred_client.get_latest_value('CPIAUCSL'),
-            'cpi_inflation_yoy': self.fred_client.calculate_velocity('CPIAUCSL', method='yoy_pct'),
-
-            # M2 money supply
-            'm2_money_supply': self.fred_client.get_latest_value('M2SL'),
-            'm2_velocity_yoy': self.fred_client.calculate_velocity('M2SL', method='yoy_pct'),
+        # Margin debt (may need alternative source)
+        data['margin_debt'] = None  # TODO: Add FINRA data source if needed
 
-            # Fed balance sheet
-            'fed_balance_sheet': self.fred_client.get_latest_value('WALCL'),
-
-            # Margin debt (may need alternative source)
-            'margin_debt': None,  # TODO: Add FINRA data source if needed
-
-            # VIX (market volatility) - use FRED to avoid Yahoo Finance rate limits
-            'vix': self.fred_client.get_latest_value('VIXCLS'),
-
-            # Dollar liquidity indicators (Signal #7)
-            'dollar_index': self.fred_client.get_latest_value('DTWEXBGS'),  # Trade-weighted dollar index
-            'fed_swap_lines': self.fred_client.get_latest_value('ROWSLAQ027S'),  # Fed foreign currency swap lines
-        }
+        return data
 
     def _fetch_positioning_indicators(self) -> Dict[str, Any]:
         """
@@ -232,19 +259,33 @@ class DataManager:
         Note: CFTC data requires separate implementation. Stubbed for now.
         """
         logger.info("Fetching positioning indicators (stubbed)...")
+        data = self._fetch_fred_indicators('positioning')
 
-        return {
-            # CFTC S&P 500 futures positioning
-            'sp500_net_speculative': None,  # TODO: Implement CFTC client
+        # CFTC S&P 500, Treasury and VIX futures positioning
+        data['sp500_net_speculative'] = None  # TODO: Implement CFTC client
+        data['treasury_net_speculative'] = None  # TODO: Implement CFTC client
+        data['vix_net_speculative'] = None  # TODO: Implement CFTC client
 
-            # CFTC Treasury futures positioning
-            'treasury_net_speculative': None,  # TODO: Implement CFTC client
+        return data
 
-            # VIX futures positioning
-            'vix_net_speculative': None,  # TODO: Implement CFTC client
+    def _fetch_fred_indicators(self, category: str) -> Dict[str, Any]:
+        """
+        Fetch a category's FRED-backed indicators from FRED_INDICATOR_SPECS.
 
-            # For now, use VIX as a proxy for complacency (FRED instead of Yahoo)
-            'vix_proxy': self.fred_client.get_latest_value('VIXCLS'),
+        fetch_all_indicators prefetches every spec'd series beforehand, so the
+        lookups here read the FRED client's warm cache (a standalone call just
+        fetches each series on demand).
+        """
+        specs = FRED_INDICATOR_SPECS[category]
+        lookups = {
+            'latest': self.fred_client.get_latest_value,
+            'moving_average': self.fred_client.get_moving_average,
+            'velocity': self.fred_client.calculate_velocity,
+            'previous': self._get_previous_value,
+        }
+        return {
+            key: lookups[lookup](series_id, **kwargs)
+            for key, series_id, lookup, kwargs in specs
         }
 
     def _fetch_recession_indicators_as_of(self, as_of_date: str) -> Dict[str, Any]:
@@ -322,13 +363,25 @@ class DataManager:
             'vix_proxy': self.fred_client.get_value_as_of('VIXCLS', as_of_date),
         }
 
+    def _prefetch_series(self, series_ids: list) -> None:
+        """
+        Fetch a set of FRED series in one concurrent batch.
+
+        Warms the FRED client cache so the per-indicator lookups that follow
+        are served locally instead of each paying an API round trip.
+        """
+        try:
+            self.fred_client.get_multiple_series(series_ids)
+        except Exception as e:
+            logger.warning(f"Batch prefetch failed, falling back to per-series fetch: {e}")
+
     def _get_previous_value(self, series_id: str, periods_back: int = 1) -> Optional[float]:
         """Get a previous value from a series (for detecting crosses)."""
         try:
             series = self.fred_client.get_series(series_id)
             if series is None or len(series) < periods_back + 1:
                 return None
-            return float(series.iloc[-(periods_back + 1)])
+            return float(series.to_numpy()[-(periods_back + 1)])
         except Exception as e:
             logger.error(f"Failed to get previous value for {series_id}: {e}")
             return None
@@ -5,30 +5,170 @@ Wrapper around fredapi library with caching, error handling,
 and velocity calculations.
 """
 
+import json
 import logging
+import threading
 import time
+import xml.etree.ElementTree as ET
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 from pathlib import Path
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 try:
-    from fredapi import Fred
+    from fredapi import Fred as _FredBase
 except ImportError:
-    Fred = None
+    _FredBase = None
 
 from src.config.config_manager import ConfigManager
 
 
 logger = logging.getLogger(__name__)
 
+# Parquet schema metadata key holding the cache write time (UNIX seconds)
+CACHE_FETCHED_AT_KEY = b'aegis_fetched_at'
+
+VELOCITY_METHODS = ('yoy_pct', 'rate', 'pct_change')
+
+# Upper bound on simultaneous FRED requests (thread pool and HTTP connection pool)
+MAX_CONCURRENT_REQUESTS = 8
+
+
+if _FredBase is not None:
+    class Fred(_FredBase):
+        """
+        fredapi client that sends every request through one pooled HTTP session
+        and parses series observations from JSON.
+
+        fredapi opens a fresh urllib connection (TCP + TLS handshake) for each
+        request. Routing requests through a shared requests.Session keeps
+        connections alive across series fetches and retries transient errors.
+        """
+
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+
+            retry = Retry(
+                total=3,
+                backoff_factor=0.3,
+                status_forcelist=(429, 500, 502, 503, 504)
+            )
+            adapter = HTTPAdapter(pool_maxsize=MAX_CONCURRENT_REQUESTS, max_retries=retry)
+            self.session = requests.Session()
+            self.session.mount('https://', adapter)
+            self._observations_url = f"{self.root_url}/series/observations"
+
+        def get_series(self, series_id, observation_start=None, observation_end=None, **kwargs):
+            """
+            Fetch observations as JSON and build the Series in one vectorized pass.
+
+            fredapi requests XML and parses every observation's date and value
+            individually in Python; for long daily histories that dominates the
+            fetch. Same signature and result as fredapi's get_series.
+            """
+            params = {'series_id': series_id, 'api_key': self.api_key, 'file_type': 'json'}
+            if observation_start is not None:
+                params['observation_start'] = pd.to_datetime(observation_start).strftime('%Y-%m-%d')
+            if observation_end is not None:
+                params['observation_end'] = pd.to_datetime(observation_end).strftime('%Y-%m-%d')
+            params.update(kwargs)
+
+            response = self.session.get(
+                self._observations_url,
+                params=params,
+                proxies=self.proxies,
+                timeout=30
+            )
+            if not response.ok:
+                # Error bodies are normally JSON, but proxies and outages return HTML or nothing
+                try:
+                    message = json.loads(response.content).get('error_message')
+                except (ValueError, AttributeError):
+                    message = None
+                raise ValueError(message or f"FRED request failed with HTTP {response.status_code}")
+            payload = json.loads(response.content)
+
+            observations = pd.DataFrame.from_records(payload['observations'], columns=['date', 'value'])
+            dates = pd.to_datetime(observations['date'], format='%Y-%m-%d').to_numpy(dtype='datetime64[ns]')
+            # Missing observations come through as '.', which coerces to NaN
+            values = pd.to_numeric(observations['value'], errors='coerce').to_numpy(dtype=np.float64)
+            return pd.Series(values, index=pd.DatetimeIndex(dates))
+
+        # Other fredapi calls still go through its name-mangled Fred.__fetch_data
+        def _Fred__fetch_data(self, url):
+            url += '&api_key=' + self.api_key
+            response = self.session.get(url, proxies=self.proxies, timeout=30)
+            if not response.ok:
+                try:
+                    message = ET.fromstring(response.content).get('message')
+                except ET.ParseError:
+                    message = None
+                raise ValueError(message or f"FRED request failed with HTTP {response.status_code}")
+            return ET.fromstring(response.content)
+
+        def close(self):
+            """Close pooled HTTP connections."""
+            self.session.close()
+else:
+    Fred = None
+
+
+def _velocity_from_series(series: pd.Series, method: str, lookback_days: int) -> Optional[float]:
+    """
+    Calculate velocity of a date-indexed series over a lookback window.
+
+    Works on the underlying numpy arrays: the lookback observation (most recent
+    one on or before `lookback_days` before the last date) is found by binary
+    search on the datetime64 index rather than by boolean-mask filtering.
+
+    Returns:
+        Velocity value, or None if there is no observation old enough
+        (or the base value is zero for percent methods)
+    """
+    values = series.to_numpy(dtype=np.float64)
+    dates = series.index.to_numpy(dtype='datetime64[ns]')
+
+    lookback_date = dates[-1] - np.timedelta64(lookback_days, 'D')
+    past_idx = int(np.searchsorted(dates, lookback_date, side='right')) - 1
+    if past_idx < 0:
+        return None
+
+    current = values[-1]
+    past_value = values[past_idx]
+
+    if method == 'rate':
+        # N-day rate of change (absolute difference / days actually elapsed)
+        actual_days = int((dates[-1] - dates[past_idx]) // np.timedelta64(1, 'D'))
+        if actual_days == 0:
+            return None
+        return float((current - past_value) / actual_days)
+
+    # 'yoy_pct' and 'pct_change' are both percent changes over the window
+    if past_value == 0:
+        return None
+    return float((current - past_value) / past_value * 100)
+
+
+def _as_of_position(series: pd.Series, as_of: datetime) -> int:
+    """Number of leading observations dated on or before `as_of` (binary search on the index)."""
+    dates = series.index.to_numpy(dtype='datetime64[ns]')
+    return int(np.searchsorted(dates, np.datetime64(as_of, 'ns'), side='right'))
+
 
 class FREDClient:
     """
     Client for fetching data from FRED API.
 
     Features:
-    - Automatic caching to reduce API calls
+    - Automatic caching to reduce API calls (in-memory LRU + Parquet on disk)
     - Velocity calculations (YoY %, N-day rate of change)
     - Graceful error handling
     - Missing data interpolation
@@ -65,21 +205,51 @@ class FREDClient:
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(parents=True, exist_ok=True)
 
-        # Rate limiting: FRED allows 120 requests/minute
-        # To be safe, limit to 1.5 requests/second = 90 requests/minute
-        self.min_request_interval = 0.67  # seconds between requests
-        self.last_request_time = 0
+        # In-memory LRU in front of the disk cache: (series_id, start, end) -> (stored_at, series)
+        self.memory_cache_size = 64
+        self._memory_cache: OrderedDict = OrderedDict()
+        self._memory_cache_lock = threading.Lock()
+
+        # Rate limiting: FRED allows 120 requests/minute. Token bucket refilling at
+        # 1.5 requests/second (90/minute) with a small burst, so a batch of cold
+        # series starts immediately but a full minute stays under the cap (100 max)
+        self.requests_per_second = 1.5
+        self.rate_limit_burst = 10
+        self._rate_limit_tokens = float(self.rate_limit_burst)
+        self._rate_limit_updated = time.monotonic()
+        self._rate_limit_lock = threading.Lock()
+
+        # Concurrent fetches in get_multiple_series (requests are still rate limited)
+        self.max_workers = MAX_CONCURRENT_REQUESTS
+
+    def close(self) -> None:
+        """Release pooled HTTP connections held by the FRED API client."""
+        if self.fred is not None:
+            self.fred.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
 
     def _rate_limit(self):
         """Enforce rate limiting to comply with FRED API limits (120 req/min)."""
-        current_time = time.time()
-        time_since_last_request = current_time - self.last_request_time
-
-        if time_since_last_request < self.min_request_interval:
-            sleep_time = self.min_request_interval - time_since_last_request
-            time.sleep(sleep_time)
+        # Reserve a token under the lock, then sleep outside it; a negative
+        # balance queues later callers behind the ones already waiting
+        with self._rate_limit_lock:
+            now = time.monotonic()
+            elapsed = now - self._rate_limit_updated
+            self._rate_limit_tokens = min(
+                float(self.rate_limit_burst),
+                self._rate_limit_tokens + elapsed * self.requests_per_second
+            )
+            self._rate_limit_updated = now
+            self._rate_limit_tokens -= 1
+            wait = -self._rate_limit_tokens / self.requests_per_second
 
-        self.last_request_time = time.time()
+        if wait > 0:
+            time.sleep(wait)
 
     def get_series(
         self,
@@ -106,13 +276,21 @@ class FREDClient:
             logger.error("FRED client not initialized (API key missing)")
             return None
 
-        # Check cache
+        # Check in-memory cache, then disk cache
+        memory_key = (series_id, start_date, end_date)
         if use_cache:
-            cached_data = self._load_from_cache(series_id, cache_ttl_hours)
+            cached_data = self._get_from_memory(memory_key, cache_ttl_hours)
             if cached_data is not None:
-                logger.debug(f"Loaded {series_id} from cache")
                 return cached_data
 
+            cached = self._load_from_cache(series_id, cache_ttl_hours)
+            if cached is not None:
+                cached_data, fetched_at = cached
+                logger.debug(f"Loaded {series_id} from cache")
+                # Keep the original fetch time so the memory copy expires with the file
+                self._put_in_memory(memory_key, cached_data, fetched_at)
+                return cached_data.copy()
+
         # Default date range: last 5 years
         if start_date is None:
             start_date = (datetime.now() - timedelta(days=365*5)).strftime('%Y-%m-%d')
@@ -136,6 +314,8 @@ class FREDClient:
             # Cache the data
             if use_cache:
                 self._save_to_cache(series_id, series)
+                self._put_in_memory(memory_key, series)
+                series = series.copy()
 
             logger.debug(f"Fetched {series_id}: {len(series)} observations")
             return series
@@ -158,7 +338,7 @@ class FREDClient:
         if series is None or len(series) == 0:
             return None
 
-        return float(series.iloc[-1])
+        return float(series.to_numpy(dtype=np.float64)[-1])
 
     def calculate_velocity(
         self,
@@ -180,65 +360,23 @@ class FREDClient:
         Returns:
             Velocity value or None
         """
+        if method not in VELOCITY_METHODS:
+            logger.error(f"Unknown velocity method: {method}")
+            return None
+
         series = self.get_series(series_id)
         if series is None or len(series) < 2:
             return None
 
         try:
-            if method == 'yoy_pct':
-                # Year-over-year percent change
-                current = series.iloc[-1]
-                year_ago_date = series.index[-1] - timedelta(days=lookback_days)
-
-                # Find closest observation to year ago
-                year_ago_series = series[series.index <= year_ago_date]
-                if len(year_ago_series) == 0:
-                    logger.warning(f"Not enough history for YoY calculation: {series_id}")
-                    return None
-
-                year_ago = year_ago_series.iloc[-1]
-                velocity = ((current - year_ago) / year_ago) * 100
-
-                logger.debug(f"{series_id} YoY velocity: {velocity:.2f}%")
-                return float(velocity)
-
-            elif method == 'rate':
-                # N-day rate of change (absolute difference / days)
-                current = series.iloc[-1]
-                past_date = series.index[-1] - timedelta(days=lookback_days)
-                past_series = series[series.index <= past_date]
-
-                if len(past_series) == 0:
-                    return None
-
-                past_value = past_series.iloc[-1]
-                actual_days = (series.index[-1] - past_series.index[-1]).days
-                if actual_days == 0:
-                    return None
-
-                velocity = (current - past_value) / actual_days
-                return float(velocity)
-
-            elif method == 'pct_change':
-                # N-day percent change
-                current = series.iloc[-1]
-                past_date = series.index[-1] - timedelta(days=lookback_days)
-                past_series = series[series.index <= past_date]
-
-                if len(past_series) == 0:
-                    return None
-
-                past_value = past_series.iloc[-1]
-                if past_value == 0:
-                    return None
-
-                velocity = ((current - past_value) / past_value) * 100
-                return float(velocity)
-
-            else:
-                logger.error(f"Unknown velocity method: {method}")
+            velocity = _velocity_from_series(series, method, lookback_days)
+            if velocity is None:
+                logger.warning(f"Cannot calculate {method} velocity for {series_id} (insufficient history or zero base)")
                 return None
 
+            logger.debug(f"{series_id} {method} velocity: {velocity:.2f}")
+            return velocity
+
         except Exception as e:
             logger.error(f"Failed to calculate velocity for {series_id}: {e}")
             return None
@@ -270,23 +408,13 @@ class FREDClient:
             return None
 
         try:
-            # Get most recent value on or before target date
-            series = series[series.index <= target_date]
-            if len(series) == 0:
-                return None
-
-            # Drop NaN values and get most recent non-NaN
-            series_clean = series.dropna()
-            if len(series_clean) == 0:
-                return None
-
-            value = float(series_clean.iloc[-1])
-
-            # Check if value is still NaN (edge case)
-            if pd.isna(value):
+            # Most recent non-NaN value on or before target date
+            values = series.to_numpy(dtype=np.float64)[:_as_of_position(series, target_date)]
+            valid = np.flatnonzero(~np.isnan(values))
+            if len(valid) == 0:
                 return None
 
-            return value
+            return float(values[valid[-1]])
 
         except Exception as e:
             logger.error(f"Failed to get {series_id} as of {as_of_date}: {e}")
@@ -311,6 +439,10 @@ class FREDClient:
         Returns:
             Velocity value or None
         """
+        if method not in VELOCITY_METHODS:
+            logger.error(f"Unknown velocity method: {method}")
+            return None
+
         # Fetch series with enough history (disable cache to avoid stale data)
         target_date = datetime.strptime(as_of_date, '%Y-%m-%d')
         start_date = (target_date - timedelta(days=lookback_days + 180)).strftime('%Y-%m-%d')
@@ -322,58 +454,11 @@ class FREDClient:
 
         try:
             # Filter to data available as of target date
-            series = series[series.index <= target_date]
+            series = series.iloc[:_as_of_position(series, target_date)]
             if len(series) < 2:
                 return None
 
-            if method == 'yoy_pct':
-                current = series.iloc[-1]
-                year_ago_date = series.index[-1] - timedelta(days=lookback_days)
-                year_ago_series = series[series.index <= year_ago_date]
-
-                if len(year_ago_series) == 0:
-                    return None
-
-                year_ago = year_ago_series.iloc[-1]
-                if year_ago == 0:
-                    return None
-                velocity = ((current - year_ago) / year_ago) * 100
-                return float(velocity)
-
-            elif method == 'rate':
-                current = series.iloc[-1]
-                past_date = series.index[-1] - timedelta(days=lookback_days)
-                past_series = series[series.index <= past_date]
-
-                if len(past_series) == 0:
-                    return None
-
-                past_value = past_series.iloc[-1]
-                actual_days = (series.index[-1] - past_series.index[-1]).days
-                if actual_days == 0:
-                    return None
-
-                velocity = (current - past_value) / actual_days
-                return float(velocity)
-
-            elif method == 'pct_change':
-                current = series.iloc[-1]
-                past_date = series.index[-1] - timedelta(days=lookback_days)
-                past_series = series[series.index <= past_date]
-
-                if len(past_series) == 0:
-                    return None
-
-                past_value = past_series.iloc[-1]
-                if past_value == 0:
-                    return None
-
-                velocity = ((current - past_value) / past_value) * 100
-                return float(velocity)
-
-            else:
-                logger.error(f"Unknown velocity method: {method}")
-                return None
+            return _velocity_from_series(series, method, lookback_days)
 
         except Exception as e:
             logger.error(f"Failed to calculate velocity for {series_id} as of {as_of_date}: {e}")
@@ -399,32 +484,72 @@ class FREDClient:
             return None
 
         try:
-            ma = series.iloc[-window:].mean()
-            return float(ma)
+            # Plain numpy slice of the tail avoids building an intermediate Series
+            tail = series.to_numpy(dtype=np.float64)[-window:]
+            tail = tail[~np.isnan(tail)]  # FRED marks missing observations as NaN
+            if len(tail) == 0:
+                return None
+            return float(tail.mean())
         except Exception as e:
             logger.error(f"Failed to calculate moving average for {series_id}: {e}")
             return None
 
+    def _get_from_memory(self, key: tuple, ttl_hours: int) -> Optional[pd.Series]:
+        """Return a copy of a series from the in-memory LRU cache if fresh enough."""
+        with self._memory_cache_lock:
+            entry = self._memory_cache.get(key)
+            if entry is None:
+                return None
+
+            fetched_at, series = entry
+            if time.time() - fetched_at > ttl_hours * 3600:
+                del self._memory_cache[key]
+                return None
+
+            self._memory_cache.move_to_end(key)
+            return series.copy()
+
+    def _put_in_memory(self, key: tuple, series: pd.Series, fetched_at: Optional[float] = None) -> None:
+        """
+        Store a series in the in-memory LRU cache, evicting the oldest entry if full.
+
+        Args:
+            key: Memory cache key (series_id, start_date, end_date)
+            series: Series to store
+            fetched_at: When the data was fetched from FRED (epoch seconds).
+                Defaults to now; pass the disk cache's timestamp for cache hits.
+        """
+        if fetched_at is None:
+            fetched_at = time.time()
+        with self._memory_cache_lock:
+            self._memory_cache[key] = (fetched_at, series)
+            self._memory_cache.move_to_end(key)
+            while len(self._memory_cache) > self.memory_cache_size:
+                self._memory_cache.popitem(last=False)
+
     def _get_cache_path(self, series_id: str) -> Path:
         """Get cache file path for a series."""
-        return self.cache_dir / f"{series_id}.csv"
+        return self.cache_dir / f"{series_id}.parquet"
 
-    def _load_from_cache(self, series_id: str, ttl_hours: int) -> Optional[pd.Series]:
-        """Load series from cache if fresh enough."""
+    def _load_from_cache(self, series_id: str, ttl_hours: int) -> Optional[Tuple[pd.Series, float]]:
+        """Load series from cache if fresh enough, with the time it was fetched."""
         cache_path = self._get_cache_path(series_id)
 
         if not cache_path.exists():
             return None
 
-        # Check cache age
-        cache_age = datetime.now() - datetime.fromtimestamp(cache_path.stat().st_mtime)
-        if cache_age > timedelta(hours=ttl_hours):
-            logger.debug(f"Cache expired for {series_id} (age: {cache_age})")
-            return None
-
         try:
-            df = pd.read_csv(cache_path, index_col=0, parse_dates=True)
-            return df.squeeze()  # Convert DataFrame to Series
+            # Freshness lives in the parquet footer, so expired entries are
+            # rejected without reading any column data
+            metadata = pq.read_schema(cache_path).metadata or {}
+            fetched_at = float(metadata[CACHE_FETCHED_AT_KEY])
+            cache_age = timedelta(seconds=time.time() - fetched_at)
+            if cache_age > timedelta(hours=ttl_hours):
+                logger.debug(f"Cache expired for {series_id} (age: {cache_age})")
+                return None
+
+            series = pq.read_table(cache_path).to_pandas()['value']
+            return series.rename(None), fetched_at
         except Exception as e:
             logger.warning(f"Failed to load cache for {series_id}: {e}")
             return None
@@ -433,8 +558,10 @@ class FREDClient:
         """Save series to cache."""
         try:
             cache_path = self._get_cache_path(series_id)
-            df = pd.DataFrame(series)
-            df.to_csv(cache_path)
+            table = pa.Table.from_pandas(series.to_frame(name='value'))
+            metadata = dict(table.schema.metadata or {})
+            metadata[CACHE_FETCHED_AT_KEY] = str(time.time()).encode()
+            pq.write_table(table.replace_schema_metadata(metadata), cache_path, compression='zstd')
             logger.debug(f"Cached {series_id} to {cache_path}")
         except Exception as e:
             logger.warning(f"Failed to cache {series_id}: {e}")
@@ -443,18 +570,27 @@ class FREDClient:
         """
         Fetch multiple series at once.
 
+        Requests are issued concurrently from a thread pool, so total latency
+        is bounded by the slowest response rather than the sum of all of them.
+
         Args:
             series_ids: List of FRED series IDs
 
         Returns:
-            Dict mapping series IDs to Series data
+            Dict mapping series IDs to Series data (failed series are omitted)
         """
-        results = {}
-        for series_id in series_ids:
-            series = self.get_series(series_id)
-            if series is not None:
-                results[series_id] = series
-        return results
+        unique_ids = list(dict.fromkeys(series_ids))
+        if not unique_ids:
+            return {}
+
+        workers = min(self.max_workers, len(unique_ids))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            fetched = executor.map(self.get_series, unique_ids)
+            return {
+                series_id: series
+                for series_id, series in zip(unique_ids, fetched)
+                if series is not None
+            }
 
 
 def main():
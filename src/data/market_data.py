@@ -5,10 +5,16 @@ Fetches market prices, indices, and metrics using yfinance library.
 """
 
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+from functools import lru_cache
+from typing import Optional, Dict, Any, List
 from pathlib import Path
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 
 try:
     import yfinance as yf
@@ -20,6 +26,72 @@ from src.config.config_manager import ConfigManager
 
 logger = logging.getLogger(__name__)
 
+# Parquet schema metadata key holding the cache write time (UNIX seconds)
+CACHE_FETCHED_AT_KEY = b'aegis_fetched_at'
+
+# Upper bound on simultaneous per-ticker Yahoo requests
+MAX_CONCURRENT_REQUESTS = 6
+
+# How long a fetched forward P/E is reused before asking Yahoo again
+FORWARD_PE_TTL_SECONDS = 900
+
+# Sector ETFs used for the defensive vs cyclical rotation signal
+SECTOR_ETFS = {
+    'XLV': 'Healthcare (defensive)',
+    'XLP': 'Consumer Staples (defensive)',
+    'XLU': 'Utilities (defensive)',
+    'XLY': 'Consumer Discretionary (cyclical)',
+    'XLI': 'Industrials (cyclical)',
+    'XLF': 'Financials (cyclical)'
+}
+DEFENSIVE_SECTORS = ('XLV', 'XLP', 'XLU')
+CYCLICAL_SECTORS = ('XLY', 'XLI', 'XLF')
+
+
+@lru_cache(maxsize=1024)
+def _cache_path(cache_dir: Path, ticker: str, period: str) -> Path:
+    """Build the cache file path for a ticker/period, memoized per process."""
+    safe_ticker = ticker.replace('^', '_')
+    return cache_dir / f"{safe_ticker}_{period}.parquet"
+
+
+@lru_cache(maxsize=128)
+def _read_cache_file(path: str, mtime_ns: int, size: int) -> pd.DataFrame:
+    """
+    Read a cached Parquet file, memoized per process.
+
+    The modification time and size are part of the cache key, so a rewritten
+    file is re-read on the next load. Callers must not mutate the result.
+    """
+    return pq.read_table(path).to_pandas()
+
+
+def _optimize_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Downcast OHLCV columns to the smallest dtypes that hold their values exactly.
+
+    Integer columns (e.g. Volume) become the narrowest integer type and
+    low-cardinality string columns become categorical. Float (price) columns
+    stay float64: float32 would turn 4512.37 into 4512.3701171875 in scores
+    and reports.
+
+    Args:
+        df: DataFrame as returned by yfinance
+
+    Returns:
+        New DataFrame with downcast columns
+    """
+    optimized = {}
+    for name, col in df.items():
+        if col.dtype.kind in 'iu':
+            optimized[name] = pd.to_numeric(col, downcast='integer')
+        elif col.dtype == object and len(col) > 0 and col.nunique() / len(col) < 0.5:
+            optimized[name] = col.astype('category')
+        else:
+            optimized[name] = col
+    # Each downcast column is already a fresh contiguous array; don't copy it again
+    return pd.DataFrame(optimized, index=df.index, copy=False)
+
 
 class MarketDataClient:
     """
@@ -55,8 +127,21 @@ class MarketDataClient:
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(parents=True, exist_ok=True)
 
+        # yf.Ticker objects reused per symbol (each one negotiates its own session)
+        self._tickers: Dict[str, Any] = {}
+
+        # Forward P/E per symbol as (fetched_at, value), valid for FORWARD_PE_TTL_SECONDS
+        self._forward_pe_cache: Dict[str, tuple] = {}
+
         logger.info("Market data client initialized")
 
+    def _ticker(self, ticker: str):
+        """Get the shared yf.Ticker for a symbol, creating it on first use."""
+        ticker_obj = self._tickers.get(ticker)
+        if ticker_obj is None:
+            ticker_obj = self._tickers[ticker] = yf.Ticker(ticker)
+        return ticker_obj
+
     def get_ticker_data(
         self,
         ticker: str,
@@ -85,13 +170,15 @@ class MarketDataClient:
 
         try:
             logger.info(f"Fetching Yahoo Finance data: {ticker} ({period})")
-            ticker_obj = yf.Ticker(ticker)
+            ticker_obj = self._ticker(ticker)
             hist = ticker_obj.history(period=period)
 
             if hist is None or len(hist) == 0:
                 logger.warning(f"No data returned for {ticker}")
                 return None
 
+            hist = _optimize_dtypes(hist)
+
             # Cache the data
             if use_cache:
                 self._save_to_cache(ticker, period, hist)
@@ -103,6 +190,85 @@ class MarketDataClient:
             logger.error(f"Failed to fetch {ticker}: {e}")
             return None
 
+    def _fetch_many(
+        self,
+        tickers: List[str],
+        period: str = "1y",
+        use_cache: bool = True,
+        cache_ttl_hours: int = 6
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        Fetch historical data for several tickers with one batched Yahoo request.
+
+        Fresh cache entries are used as-is; the remaining tickers are downloaded
+        together with yf.download and cached individually. Tickers missing from
+        the batch response fall back to get_ticker_data.
+
+        Args:
+            tickers: Ticker symbols
+            period: Data period (see get_ticker_data)
+            use_cache: Whether to use cached data
+            cache_ttl_hours: Cache time-to-live in hours
+
+        Returns:
+            Dict mapping ticker to OHLCV DataFrame (tickers without data are omitted)
+        """
+        results = {}
+        missing = []
+        for ticker in tickers:
+            cached_data = self._load_from_cache(ticker, period, cache_ttl_hours) if use_cache else None
+            if cached_data is not None:
+                results[ticker] = cached_data
+            else:
+                missing.append(ticker)
+
+        if missing:
+            try:
+                logger.info(f"Fetching Yahoo Finance data: {', '.join(missing)} ({period})")
+                # actions/ignore_tz make each slice match Ticker.history (Dividends and
+                # Stock Splits columns, exchange-tz index), since both share a cache key
+                batch = yf.download(
+                    ' '.join(missing),
+                    period=period,
+                    group_by='ticker',
+                    actions=True,
+                    ignore_tz=False,
+                    threads=True,
+                    progress=False
+                )
+            except Exception as e:
+                logger.error(f"Batch download failed for {', '.join(missing)}: {e}")
+                batch = None
+
+            if batch is not None and isinstance(batch.columns, pd.MultiIndex):
+                batch_tickers = set(batch.columns.get_level_values(0))
+                for ticker in missing:
+                    if ticker not in batch_tickers:
+                        continue
+                    hist = batch[ticker].dropna(how='all')
+                    if len(hist) == 0:
+                        continue
+                    hist = _optimize_dtypes(hist)
+                    if use_cache:
+                        self._save_to_cache(ticker, period, hist)
+                    results[ticker] = hist
+
+            # Fall back to one request per ticker for anything the batch didn't cover,
+            # issued concurrently so latency is bounded by the slowest response
+            remaining = [ticker for ticker in missing if ticker not in results]
+            if remaining:
+                def fetch(ticker):
+                    return self.get_ticker_data(ticker, period=period, use_cache=use_cache,
+                                                cache_ttl_hours=cache_ttl_hours)
+
+                workers = min(MAX_CONCURRENT_REQUESTS, len(remaining))
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    for ticker, data in zip(remaining, executor.map(fetch, remaining)):
+                        if data is not None:
+                            results[ticker] = data
+
+        return results
+
     def get_latest_price(self, ticker: str) -> Optional[float]:
         """
         Get the most recent closing price.
@@ -114,10 +280,14 @@ class MarketDataClient:
             Latest close price or None
         """
         data = self.get_ticker_data(ticker, period="5d")
-        if data is None or len(data) == 0:
+        if data is None:
+            return None
+
+        closes = data['Close'].to_numpy()
+        if closes.size == 0:
             return None
 
-        return float(data['Close'].iloc[-1])
+        return float(closes[-1])
 
     def get_vix(self) -> Optional[float]:
         """
@@ -147,8 +317,20 @@ class MarketDataClient:
         Returns:
             Forward P/E ratio or None
         """
+        # ticker.info is a large payload; reuse a recent answer for the same symbol
+        cached = self._forward_pe_cache.get(ticker)
+        if cached is not None and time.time() - cached[0] < FORWARD_PE_TTL_SECONDS:
+            return cached[1]
+
+        pe = self._fetch_forward_pe(ticker)
+        if pe is not None:
+            self._forward_pe_cache[ticker] = (time.time(), pe)
+        return pe
+
+    def _fetch_forward_pe(self, ticker: str) -> Optional[float]:
+        """Fetch forward P/E from Yahoo Finance ticker info (uncached; see get_forward_pe)."""
         try:
-            ticker_obj = yf.Ticker(ticker)
+            ticker_obj = self._ticker(ticker)
             info = ticker_obj.info
 
             # Try different keys (Yahoo Finance API can be inconsistent)
@@ -174,39 +356,32 @@ class MarketDataClient:
         Returns:
             Dict with sector ETF performance, or None
         """
-        # Sector ETFs
-        sectors = {
-            'XLV': 'Healthcare (defensive)',
-            'XLP': 'Consumer Staples (defensive)',
-            'XLU': 'Utilities (defensive)',
-            'XLY': 'Consumer Discretionary (cyclical)',
-            'XLI': 'Industrials (cyclical)',
-            'XLF': 'Financials (cyclical)'
-        }
-
         try:
+            sector_data = self._fetch_many(list(SECTOR_ETFS), period="3mo")
+
+            # First/last close per sector with enough history, as float64 vectors
+            tickers = [
+                ticker for ticker in SECTOR_ETFS
+                if sector_data.get(ticker) is not None and len(sector_data[ticker]) > 1
+            ]
+            closes = [sector_data[ticker]['Close'].to_numpy() for ticker in tickers]
+            first = np.array([c[0] for c in closes], dtype=np.float64)
+            last = np.array([c[-1] for c in closes], dtype=np.float64)
+
+            # 3-month returns for all sectors in one vectorized expression
+            returns = (last / first - 1) * 100
+
             results = {}
-            for ticker, name in sectors.items():
-                data = self.get_ticker_data(ticker, period="3mo")
-                if data is not None and len(data) > 1:
-                    # 3-month return
-                    returns = (data['Close'].iloc[-1] / data['Close'].iloc[0] - 1) * 100
-                    results[ticker] = {
-                        'name': name,
-                        'return_3mo': float(returns),
-                        'current_price': float(data['Close'].iloc[-1])
-                    }
+            for i, ticker in enumerate(tickers):
+                results[ticker] = {
+                    'name': SECTOR_ETFS[ticker],
+                    'return_3mo': float(returns[i]),
+                    'current_price': float(last[i])
+                }
 
             # Calculate defensive vs cyclical
-            defensive_avg = sum(
-                v['return_3mo'] for k, v in results.items()
-                if k in ['XLV', 'XLP', 'XLU']
-            ) / 3
-
-            cyclical_avg = sum(
-                v['return_3mo'] for k, v in results.items()
-                if k in ['XLY', 'XLI', 'XLF']
-            ) / 3
+            defensive_avg = float(returns[np.isin(tickers, DEFENSIVE_SECTORS)].sum()) / len(DEFENSIVE_SECTORS)
+            cyclical_avg = float(returns[np.isin(tickers, CYCLICAL_SECTORS)].sum()) / len(CYCLICAL_SECTORS)
 
             results['rotation_signal'] = {
                 'defensive_avg': defensive_avg,
@@ -258,18 +433,18 @@ class MarketDataClient:
             end_date = (target_date + timedelta(days=1)).strftime('%Y-%m-%d')
 
             # Use yfinance download with date range
-            ticker_obj = yf.Ticker(ticker)
+            ticker_obj = self._ticker(ticker)
             hist = ticker_obj.history(start=start_date, end=end_date)
 
             if hist is None or len(hist) == 0:
                 return None
 
             # Get most recent price on or before target date
-            hist = hist[hist.index <= target_date]
-            if len(hist) == 0:
+            closes = hist['Close'].to_numpy()[hist.index <= target_date]
+            if closes.size == 0:
                 return None
 
-            return float(hist['Close'].iloc[-1])
+            return float(closes[-1])
 
         except Exception as e:
             logger.error(f"Failed to get {ticker} price as of {as_of_date}: {e}")
@@ -289,25 +464,30 @@ class MarketDataClient:
 
     def _get_cache_path(self, ticker: str, period: str) -> Path:
         """Get cache file path for a ticker/period."""
-        safe_ticker = ticker.replace('^', '_')
-        return self.cache_dir / f"{safe_ticker}_{period}.csv"
+        return _cache_path(self.cache_dir, ticker, period)
 
     def _load_from_cache(self, ticker: str, period: str, ttl_hours: int) -> Optional[pd.DataFrame]:
         """Load ticker data from cache if fresh enough."""
         cache_path = self._get_cache_path(ticker, period)
 
-        if not cache_path.exists():
-            return None
-
-        # Check cache age
-        cache_age = datetime.now() - datetime.fromtimestamp(cache_path.stat().st_mtime)
-        if cache_age > timedelta(hours=ttl_hours):
-            logger.debug(f"Cache expired for {ticker} (age: {cache_age})")
+        try:
+            stat = cache_path.stat()
+        except FileNotFoundError:
             return None
 
         try:
-            df = pd.read_csv(cache_path, index_col=0, parse_dates=True)
-            return df
+            # Freshness lives in the parquet footer, so expired entries are
+            # rejected without reading any column data
+            metadata = pq.read_schema(cache_path).metadata or {}
+            fetched_at = float(metadata[CACHE_FETCHED_AT_KEY])
+            cache_age = timedelta(seconds=time.time() - fetched_at)
+            if cache_age > timedelta(hours=ttl_hours):
+                logger.debug(f"Cache expired for {ticker} (age: {cache_age})")
+                return None
+
+            df = _read_cache_file(str(cache_path), stat.st_mtime_ns, stat.st_size)
+            # Each caller gets its own copy of the shared parsed frame
+            return df.copy()
         except Exception as e:
             logger.warning(f"Failed to load cache for {ticker}: {e}")
             return None
@@ -316,7 +496,10 @@ class MarketDataClient:
         """Save ticker data to cache."""
         try:
             cache_path = self._get_cache_path(ticker, period)
-            data.to_csv(cache_path)
+            table = pa.Table.from_pandas(_optimize_dtypes(data))
+            metadata = dict(table.schema.metadata or {})
+            metadata[CACHE_FETCHED_AT_KEY] = str(time.time()).encode()
+            pq.write_table(table.replace_schema_metadata(metadata), cache_path, compression='snappy')
             logger.debug(f"Cached {ticker} to {cache_path}")
         except Exception as e:
             logger.warning(f"Failed to cache {ticker}: {e}")
@@ -15,6 +15,9 @@ from io import StringIO
 
 logger = logging.getLogger(__name__)
 
+# Clock used for cache-age checks (module-level so tests can move time forward)
+_now = datetime.now
+
 
 class ShillerDataClient:
     """
@@ -290,7 +293,7 @@ class ShillerDataClient:
             return None
 
         # Check cache age
-        cache_age = datetime.now() - datetime.fromtimestamp(cache_path.stat().st_mtime)
+        cache_age = _now() - datetime.fromtimestamp(cache_path.stat().st_mtime)
         if cache_age > timedelta(days=ttl_days):
             logger.debug(f"Dataset cache expired (age: {cache_age.days} days)")
             return None
@@ -380,7 +383,7 @@ class ShillerDataClient:
             return None
 
         # Check cache age
-        cache_age = datetime.now() - datetime.fromtimestamp(cache_path.stat().st_mtime)
+        cache_age = _now() - datetime.fromtimestamp(cache_path.stat().st_mtime)
         if cache_age > timedelta(days=ttl_days):
             logger.debug(f"Cache expired (age: {cache_age.days} days)")
             return None
@@ -4,7 +4,11 @@ Risk Score Aggregator
 Combines all dimension scores into overall risk score using weighted average.
 """
 
+import copy
+import hashlib
+import json
 import logging
+from collections import OrderedDict
 from typing import Dict, Any, Optional
 
 from src.config.config_manager import ConfigManager
@@ -17,6 +21,9 @@ from src.scoring.positioning import PositioningScorer
 
 logger = logging.getLogger(__name__)
 
+# Number of recent results kept by RiskAggregator's memo cache
+RESULT_CACHE_SIZE = 64
+
 
 class RiskAggregator:
     """
@@ -30,12 +37,23 @@ class RiskAggregator:
     - Positioning: 0.10
     """
 
-    def __init__(self, config: Optional[ConfigManager] = None):
+    def __init__(
+        self,
+        config: Optional[ConfigManager] = None,
+        scorers: Optional[Dict[str, Any]] = None
+    ):
         """
         Initialize risk aggregator.
 
         Args:
             config: ConfigManager instance. If None, creates new one.
+            scorers: Optional pre-built scorers keyed by dimension ('recession',
+                'credit', 'valuation', 'liquidity', 'positioning'). Each scorer
+                reads its thresholds from the config it was built with, while
+                the weights here come from ``config``, so injected scorers must
+                be built from the same configuration. Scorers hold no per-call
+                state, so one set can be shared by several aggregators; missing
+                dimensions get a new scorer built from ``config``.
         """
         if config is None:
             config = ConfigManager()
@@ -45,12 +63,18 @@ class RiskAggregator:
         self.weights = config.get_all_weights()
         self._validate_weights()
 
-        # Initialize scorers
-        self.recession_scorer = RecessionScorer(config)
-        self.credit_scorer = CreditScorer(config)
-        self.valuation_scorer = ValuationScorer(config)
-        self.liquidity_scorer = LiquidityScorer(config)
-        self.positioning_scorer = PositioningScorer(config)
+        # Initialize scorers (reusing any that were passed in)
+        scorers = scorers or {}
+        self.recession_scorer = scorers.get('recession') or RecessionScorer(config)
+        self.credit_scorer = scorers.get('credit') or CreditScorer(config)
+        self.valuation_scorer = scorers.get('valuation') or ValuationScorer(config)
+        self.liquidity_scorer = scorers.get('liquidity') or LiquidityScorer(config)
+        self.positioning_scorer = scorers.get('positioning') or PositioningScorer(config)
+
+        # Memo of recent results keyed by a digest of the input data. Scoring is a
+        # pure function of the data and config, so identical inputs (dashboard
+        # refreshes, repeated backtest dates) skip re-scoring.
+        self._result_cache: OrderedDict = OrderedDict()
 
         logger.info("Risk aggregator initialized with weights: %s", self.weights)
 
@@ -76,14 +100,97 @@ class RiskAggregator:
                 - all_signals: All triggered signals from all dimensions
                 - metadata: Calculation details
         """
+        cache_key = self._result_cache_key(data)
+        if cache_key is not None and cache_key in self._result_cache:
+            self._result_cache.move_to_end(cache_key)
+            result = copy.deepcopy(self._result_cache[cache_key])
+            logger.info(f"Overall risk score: {result['overall_score']:.2f}/10 ({result['tier']}) [cached]")
+            return result
+
+        result = self._calculate_overall_risk(data)
+
+        if cache_key is not None:
+            self._result_cache[cache_key] = copy.deepcopy(result)
+            if len(self._result_cache) > RESULT_CACHE_SIZE:
+                self._result_cache.popitem(last=False)
+
+        return result
+
+    def calculate_overall_risk_from_scores(self, scores: Dict[str, float]) -> Dict[str, Any]:
+        """
+        Aggregate already-computed dimension scores, skipping dimension scoring.
+
+        Weights are re-normalized over the dimensions present, so omitting a
+        dimension treats it as having no data; a dimension with no configured
+        weight raises ValueError. The tier is the plain threshold
+        tier; overrides that need raw indicator data (e.g. the liquidity
+        override) only apply in calculate_overall_risk.
+
+        Args:
+            scores: Dict mapping dimension names to scores (0-10)
+
+        Returns:
+            Dict with:
+                - overall_score: Weighted average risk (0-10), rounded to 2 places
+                - tier: Risk tier for that score
+                - normalized_weights: Weights used, re-normalized to sum to 1.0
+        """
+        if not scores:
+            raise ValueError("No valid dimensions with data available for scoring")
+
+        unknown = sorted(set(scores) - set(self.weights))
+        if unknown:
+            raise ValueError(
+                f"Unknown dimensions {unknown}; expected a subset of {sorted(self.weights)}"
+            )
+
+        total_weight = sum(self.weights[dim] for dim in scores)
+        normalized_weights = {dim: self.weights[dim] / total_weight for dim in scores}
+
+        overall_score = round(
+            sum(score * normalized_weights[dim] for dim, score in scores.items()), 2
+        )
+
+        return {
+            'overall_score': overall_score,
+            'tier': self._get_risk_tier(overall_score),
+            'normalized_weights': normalized_weights
+        }
+
+    def _result_cache_key(self, data: Dict[str, Any]) -> Optional[bytes]:
+        """
+        Digest of the scoring inputs, or None if the data can't be keyed.
+
+        Fetch metadata (timestamps, durations) doesn't affect scoring and is
+        left out. Data holding non-JSON values (e.g. pandas objects) is not
+        cached rather than risk keying on a lossy repr.
+        """
+        scoring_inputs = {key: value for key, value in data.items() if key != 'metadata'}
+        try:
+            encoded = json.dumps(scoring_inputs, sort_keys=True).encode()
+        except (TypeError, ValueError):
+            return None
+        return hashlib.blake2b(encoded, digest_size=16).digest()
+
+    def _calculate_overall_risk(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Score all dimensions and aggregate (uncached; see calculate_overall_risk)."""
         logger.info("Calculating overall risk score...")
 
+        # Look up each dimension's indicator dict once; the scorers and the
+        # warning checks below all read from these
+        recession_data = data.get('recession', {})
+        credit_data = data.get('credit', {})
+        valuation_data = data.get('valuation', {})
+        liquidity_data = data.get('liquidity', {})
+        positioning_data = data.get('positioning', {})
+        sentiment_data = data.get('sentiment', {})
+
         # Calculate individual dimension scores
-        recession_result = self.recession_scorer.calculate_score(data.get('recession', {}))
-        credit_result = self.credit_scorer.calculate_score(data.get('credit', {}))
-        valuation_result = self.valuation_scorer.calculate_score(data.get('valuation', {}))
-        liquidity_result = self.liquidity_scorer.calculate_score(data.get('liquidity', {}))
-        positioning_result = self.positioning_scorer.calculate_score(data.get('positioning', {}))
+        recession_result = self.recession_scorer.calculate_score(recession_data)
+        credit_result = self.credit_scorer.calculate_score(credit_data)
+        valuation_result = self.valuation_scorer.calculate_score(valuation_data)
+        liquidity_result = self.liquidity_scorer.calculate_score(liquidity_data)
+        positioning_result = self.positioning_scorer.calculate_score(positioning_data)
 
         # Extract scores and results
         dimension_results = {
@@ -117,29 +224,15 @@ class RiskAggregator:
                 excluded_dimensions.append(dim)
                 logger.warning(f"Excluding {dim} from aggregation (no data available)")
 
-        # Re-normalize weights for valid dimensions only
-        if not valid_dimensions:
-            raise ValueError("No valid dimensions with data available for scoring")
-
-        total_valid_weight = sum(self.weights[dim] for dim in valid_dimensions)
-        normalized_weights = {
-            dim: self.weights[dim] / total_valid_weight
-            for dim in valid_dimensions
-        }
+        # Weighted average over valid dimensions only (weights re-normalized)
+        weighted = self.calculate_overall_risk_from_scores(valid_dimensions)
+        normalized_weights = weighted['normalized_weights']
+        overall_score = weighted['overall_score']
 
         if excluded_dimensions:
             logger.info(f"Re-normalized weights (excluded: {', '.join(excluded_dimensions)})")
             logger.info(f"Normalized weights: {normalized_weights}")
 
-        # Calculate weighted average using only valid dimensions
-        overall_score = sum(
-            valid_dimensions[dim] * normalized_weights[dim]
-            for dim in valid_dimensions
-        )
-
-        # Round to 2 decimal places
-        overall_score = round(overall_score, 2)
-
         # Calculate confidence score
         confidence = self._calculate_confidence(
             dimension_results=dimension_results,
@@ -155,7 +248,7 @@ class RiskAggregator:
         # This catches Fed-driven corrections like 2022 that don't trigger recession/credit alarms
         liquidity_override = self._check_liquidity_override(
             liquidity_score=dimension_scores.get('liquidity', 0),
-            liquidity_data=data.get('liquidity', {})
+            liquidity_data=liquidity_data
         )
 
         if liquidity_override['active'] and tier == 'GREEN':
@@ -163,42 +256,42 @@ class RiskAggregator:
             logger.warning(f"LIQUIDITY OVERRIDE: Tier elevated from GREEN to YELLOW due to extreme Fed tightening")
 
         # Check for valuation-based early warning (leading indicator)
-        valuation_warning = self._check_valuation_warning(data.get('valuation', {}))
+        valuation_warning = self._check_valuation_warning(valuation_data)
 
         # Check for double inversion warning (yield curve + credit stress)
         double_inversion_warning = self._check_double_inversion(
-            data.get('recession', {}),
-            data.get('credit', {})
+            recession_data,
+            credit_data
         )
 
         # Check for real interest rate warning (Fed tightening)
-        real_rate_warning = self._check_real_rate_warning(data.get('liquidity', {}))
+        real_rate_warning = self._check_real_rate_warning(liquidity_data)
 
         # Check for earnings recession warning (profit decline)
         # NOTE: Requires historical data window (not available during live fetch)
         earnings_recession_warning = self._check_earnings_recession(
-            data.get('valuation', {}),
+            valuation_data,
             None  # No historical data in live mode - will be populated during backtest
         )
 
         # Check for housing bubble warning (housing market stress)
         # NOTE: Requires historical data window (not available during live fetch)
         housing_bubble_warning = self._check_housing_bubble(
-            data.get('valuation', {}),
+            valuation_data,
             None  # No historical data in live mode - will be populated during backtest
         )
 
         # Check for dollar liquidity stress (global dollar funding shortage)
         # NOTE: Requires historical data window (not available during live fetch)
         dollar_liquidity_warning = self._check_dollar_liquidity_stress(
-            data.get('liquidity', {}),
+            liquidity_data,
             None  # No historical data in live mode - will be populated during backtest
         )
 
         # Check for retail capitulation (extreme sentiment - contrarian indicator)
         # NOTE: Requires manual AAII sentiment data (weekly CSV download)
         retail_capitulation_warning = self._check_retail_capitulation(
-            data.get('sentiment', {})
+            sentiment_data
         )
 
         # Collect all signals
@@ -209,6 +302,7 @@ class RiskAggregator:
             'liquidity': liquidity_result['signals'],
             'positioning': positioning_result['signals']
         }
+        total_signals = sum(len(signals) for signals in all_signals.values())
 
         logger.info(f"Overall risk score: {overall_score:.2f}/10 ({tier})")
 
@@ -241,7 +335,8 @@ class RiskAggregator:
                     dim: f"{valid_dimensions[dim]:.2f} × {normalized_weights[dim]:.2f} = {valid_dimensions[dim] * normalized_weights[dim]:.2f}"
                     for dim in valid_dimensions
                 },
-                'confidence_details': confidence
+                'confidence_details': confidence,
+                'total_signals': total_signals
             }
         }
 
@@ -12,6 +12,8 @@ Calculates credit stress risk (0-10) using:
 import logging
 from typing import Dict, Any, Optional
 
+from src.scoring.signals import signal_tags
+
 
 logger = logging.getLogger(__name__)
 
@@ -49,6 +51,7 @@ class CreditScorer:
                 - score: Overall credit stress (0-10)
                 - components: Breakdown of sub-scores
                 - signals: List of triggered signals
+                - signal_tags: Sorted severity tags of the signals (e.g. ['WARNING'])
         """
         score = 0.0
         components = {}
@@ -112,7 +115,8 @@ class CreditScorer:
         return {
             'score': round(score, 2),
             'components': components,
-            'signals': signals
+            'signals': signals,
+            'signal_tags': signal_tags(signals)
         }
 
     def _score_hy_spread(
@@ -10,6 +10,8 @@ Calculates liquidity risk (0-10) using:
 import logging
 from typing import Dict, Any, Optional
 
+from src.scoring.signals import signal_tags
+
 
 logger = logging.getLogger(__name__)
 
@@ -32,7 +34,8 @@ class LiquidityScorer:
                 - vix: VIX volatility index
 
         Returns:
-            Dict with score, components, signals
+            Dict with score, components, signals and signal_tags (the sorted
+            severity tags of the signals, e.g. ['WARNING'])
         """
         score = 0.0
         components = {}
@@ -80,7 +83,8 @@ class LiquidityScorer:
         return {
             'score': round(score, 2),
             'components': components,
-            'signals': signals
+            'signals': signals,
+            'signal_tags': signal_tags(signals)
         }
 
     def _score_fed_trajectory(self, velocity: float) -> tuple[float, Optional[str]]:
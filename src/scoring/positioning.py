@@ -12,6 +12,8 @@ NOTE: Full CFTC data integration is stubbed for MVP. Uses VIX as proxy.
 import logging
 from typing import Dict, Any, Optional
 
+from src.scoring.signals import signal_tags
+
 
 logger = logging.getLogger(__name__)
 
@@ -33,7 +35,8 @@ class PositioningScorer:
                 - vix_proxy: VIX as proxy for speculation/complacency
 
         Returns:
-            Dict with score, components, signals
+            Dict with score, components, signals and signal_tags (the sorted
+            severity tags of the signals, e.g. ['WARNING'])
         """
         score = 0.0
         components = {}
@@ -67,7 +70,8 @@ class PositioningScorer:
         return {
             'score': round(score, 2),
             'components': components,
-            'signals': signals
+            'signals': signals,
+            'signal_tags': signal_tags(signals)
         }
 
     def _score_vix_positioning(self, vix: float) -> tuple[float, Optional[str]]:
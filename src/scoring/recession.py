@@ -11,6 +11,8 @@ Calculates recession risk (0-10) using velocity-based indicators:
 import logging
 from typing import Dict, Any, Optional
 
+from src.scoring.signals import signal_tags
+
 
 logger = logging.getLogger(__name__)
 
@@ -49,6 +51,7 @@ class RecessionScorer:
                 - score: Overall recession risk (0-10)
                 - components: Breakdown of sub-scores
                 - signals: List of triggered signals
+                - signal_tags: Sorted severity tags of the signals (e.g. ['WARNING'])
         """
         score = 0.0
         components = {}
@@ -112,7 +115,8 @@ class RecessionScorer:
         return {
             'score': round(score, 2),
             'components': components,
-            'signals': signals
+            'signals': signals,
+            'signal_tags': signal_tags(signals)
         }
 
     def _score_unemployment_velocity(self, velocity_yoy: float) -> tuple[float, Optional[str]]:
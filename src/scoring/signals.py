@@ -0,0 +1,22 @@
+"""
+Signal helpers shared by the dimension scorers.
+
+Signals are human-readable strings prefixed with a severity tag,
+e.g. "WARNING: VIX very low, complacency risk (12.0)".
+"""
+
+from typing import Iterable, List
+
+
+def signal_tags(signals: Iterable[str]) -> List[str]:
+    """
+    Collect the severity tags of a scorer's signals.
+
+    Args:
+        signals: Signal strings of the form "<TAG>: <message>"
+
+    Returns:
+        Sorted list of distinct tags (e.g. ['NOTE', 'WARNING']), JSON-serializable
+        so it can travel with the rest of the score dict
+    """
+    return sorted({signal.split(':', 1)[0] for signal in signals})
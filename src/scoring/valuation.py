@@ -10,6 +10,8 @@ Calculates valuation risk (0-10) using:
 import logging
 from typing import Dict, Any, Optional
 
+from src.scoring.signals import signal_tags
+
 
 logger = logging.getLogger(__name__)
 
@@ -32,7 +34,8 @@ class ValuationScorer:
                 - sp500_forward_pe: S&P 500 forward P/E
 
         Returns:
-            Dict with score, components, signals
+            Dict with score, components, signals and signal_tags (the sorted
+            severity tags of the signals, e.g. ['WARNING'])
         """
         score = 0.0
         components = {}
@@ -81,7 +84,8 @@ class ValuationScorer:
         return {
             'score': round(score, 2),
             'components': components,
-            'signals': signals
+            'signals': signals,
+            'signal_tags': signal_tags(signals)
         }
 
     def _score_cape(self, cape: float) -> tuple[float, Optional[str]]:
@@ -33,6 +33,64 @@ def test_data_dir(project_root):
     return project_root / "tests" / "data"
 
 
+# Scorers only read their (default) config, so each is built once per session,
+# and only when a selected test asks for it (imports stay inside the fixtures).
+
+@pytest.fixture(scope="session")
+def recession_scorer():
+    """Session-wide RecessionScorer."""
+    from src.scoring.recession import RecessionScorer
+    return RecessionScorer()
+
+
+@pytest.fixture(scope="session")
+def credit_scorer():
+    """Session-wide CreditScorer."""
+    from src.scoring.credit import CreditScorer
+    return CreditScorer()
+
+
+@pytest.fixture(scope="session")
+def valuation_scorer():
+    """Session-wide ValuationScorer."""
+    from src.scoring.valuation import ValuationScorer
+    return ValuationScorer()
+
+
+@pytest.fixture(scope="session")
+def liquidity_scorer():
+    """Session-wide LiquidityScorer."""
+    from src.scoring.liquidity import LiquidityScorer
+    return LiquidityScorer()
+
+
+@pytest.fixture(scope="session")
+def positioning_scorer():
+    """Session-wide PositioningScorer."""
+    from src.scoring.positioning import PositioningScorer
+    return PositioningScorer()
+
+
+@pytest.fixture(scope="session")
+def shared_scorers(recession_scorer, credit_scorer, valuation_scorer,
+                   liquidity_scorer, positioning_scorer):
+    """The session-wide scorers keyed by dimension, as RiskAggregator(scorers=...) takes them."""
+    return {
+        'recession': recession_scorer,
+        'credit': credit_scorer,
+        'valuation': valuation_scorer,
+        'liquidity': liquidity_scorer,
+        'positioning': positioning_scorer
+    }
+
+
+@pytest.fixture(scope="session")
+def aggregator(shared_scorers):
+    """Session-wide RiskAggregator built on the shared scorers."""
+    from src.scoring.aggregator import RiskAggregator
+    return RiskAggregator(scorers=shared_scorers)
+
+
 # ============================================================================
 # Configuration fixtures
 # ============================================================================
@@ -185,10 +243,9 @@ def mock_config():
 # ============================================================================
 
 @pytest.fixture
-def temp_cache_dir():
-    """Create a temporary cache directory for testing."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        yield tmpdir
+def temp_cache_dir(tmp_path_factory):
+    """Create a unique cache directory under pytest's session temp root."""
+    return str(tmp_path_factory.mktemp("cache"))
 
 
 # ============================================================================
@@ -402,6 +459,7 @@ def pytest_configure(config):
     config.addinivalue_line("markers", "requires_secrets: Tests requiring API keys")
     config.addinivalue_line("markers", "smoke: Quick smoke tests")
     config.addinivalue_line("markers", "backtest: Backtesting tests")
+    config.addinivalue_line("markers", "io: Tests touching the filesystem or stubbed network")
 
 
 def pytest_collection_modifyitems(config, items):
@@ -4,7 +4,6 @@ Unit tests for alerts modules (alert_logic, email_sender, history_manager)
 
 import pytest
 import tempfile
-import os
 from datetime import datetime, timedelta, date
 from pathlib import Path
 
@@ -4,10 +4,10 @@ Unit tests for ConfigManager
 
 import pytest
 import tempfile
-import os
 from pathlib import Path
 import yaml
 import configparser
+from unittest.mock import patch
 
 from src.config.config_manager import ConfigManager
 
@@ -180,7 +180,7 @@ class TestConfigManager:
     def test_missing_config_file(self, temp_config_dir):
         """Test handling of missing config files."""
         # Remove one config file
-        os.remove(temp_config_dir / 'regime_shifts.yaml')
+        (temp_config_dir / 'regime_shifts.yaml').unlink()
 
         # Should still load successfully, just log a warning
         config = ConfigManager(config_dir=temp_config_dir)
@@ -188,23 +188,51 @@ class TestConfigManager:
         assert 'indicators' in config.config_data
         assert 'regime_shifts' not in config.config_data
 
+    def test_yaml_parsed_once_until_file_changes(self, temp_config_dir):
+        """Test that parsed YAML is reused across instances and refreshed on edit."""
+        with patch('src.config.config_manager.yaml.load', wraps=yaml.load) as mock_load:
+            first = ConfigManager(config_dir=temp_config_dir)
+            second = ConfigManager(config_dir=temp_config_dir)
+            assert mock_load.call_count == 3  # app, indicators, regime_shifts
+
+            # Instances don't share mutable config data
+            second.config_data['app']['app']['name'] = 'Changed'
+            assert first.get('app.app.name') == 'Aegis Test'
+
+            # Editing a file invalidates its cached parse
+            app_path = temp_config_dir / 'app.yaml'
+            app_config = yaml.safe_load(app_path.read_text())
+            app_config['app']['name'] = 'Aegis Edited'
+            app_path.write_text(yaml.dump(app_config))
+
+            mock_load.reset_mock()
+            third = ConfigManager(config_dir=temp_config_dir)
+            assert mock_load.call_count == 1
+            assert third.get('app.app.name') == 'Aegis Edited'
+
     def test_missing_secrets_file(self, temp_config_dir):
         """Test handling of missing secrets file."""
         # Remove secrets file
-        os.remove(temp_config_dir / 'credentials' / 'secrets.ini')
+        (temp_config_dir / 'credentials' / 'secrets.ini').unlink()
 
         # Should still load successfully, just log a warning
         config = ConfigManager(config_dir=temp_config_dir)
         assert config.get_secret('fred_api_key') is None
 
 
+@pytest.fixture(scope="module")
+def real_config():
+    """Load the actual project configuration once for all integration tests."""
+    # This assumes we're running from project root
+    return ConfigManager()
+
+
 class TestConfigManagerIntegration:
     """Integration tests using actual config files."""
 
-    def test_load_actual_config(self):
+    def test_load_actual_config(self, real_config):
         """Test loading the actual project configuration."""
-        # This assumes we're running from project root
-        config = ConfigManager()
+        config = real_config
 
         # Verify basic structure
         assert config.config_data is not None
@@ -215,9 +243,9 @@ class TestConfigManagerIntegration:
         total = sum(weights.values())
         assert 0.99 <= total <= 1.01
 
-    def test_actual_indicator_config(self):
+    def test_actual_indicator_config(self, real_config):
         """Test that actual indicator config has expected structure."""
-        config = ConfigManager()
+        config = real_config
 
         # Check recession indicators exist
         recession = config.get_indicator_config('recession_indicators')
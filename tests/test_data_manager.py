@@ -2,13 +2,33 @@
 Unit tests for DataManager
 """
 
+import threading
+from types import SimpleNamespace
+
 import pytest
-from unittest.mock import Mock, patch, MagicMock
+import pandas as pd
+from unittest.mock import Mock, patch
 
-from src.data.data_manager import DataManager
+from src.data.data_manager import DataManager, FRED_INDICATOR_SPECS
 from src.config.config_manager import ConfigManager
 
 
+class CallStub:
+    """Callable returning a fixed value and recording calls (cheaper than MagicMock)."""
+
+    def __init__(self, return_value):
+        self.return_value = return_value
+        self.calls = []
+
+    def __call__(self, *args, **kwargs):
+        self.calls.append((args, kwargs))
+        return self.return_value
+
+    @property
+    def called(self):
+        return bool(self.calls)
+
+
 class TestDataManager:
     """Test suite for DataManager."""
 
@@ -20,236 +40,262 @@ class TestDataManager:
 
     @pytest.fixture
     def mock_clients(self):
-        """Create mock FRED and market data clients."""
-        fred_client = MagicMock()
-        market_client = MagicMock()
-
-        # Setup default return values
-        fred_client.get_latest_value.return_value = 100.0
-        fred_client.get_moving_average.return_value = 95.0
-        fred_client.calculate_velocity.return_value = 5.0
-        market_client.get_sp500_price.return_value = 4500.0
-        market_client.get_vix.return_value = 15.0
-        market_client.get_forward_pe.return_value = 20.0
-
-        return fred_client, market_client
+        """Create stub FRED, market data and Shiller clients with fixed return values."""
+        fred_client = SimpleNamespace(
+            get_series=CallStub(None),
+            get_multiple_series=CallStub({}),
+            get_latest_value=CallStub(100.0),
+            get_moving_average=CallStub(95.0),
+            calculate_velocity=CallStub(5.0),
+        )
+        market_client = SimpleNamespace(
+            get_sp500_price=CallStub(4500.0),
+            get_vix=CallStub(15.0),
+            get_forward_pe=CallStub(20.0),
+        )
+        shiller_client = SimpleNamespace(
+            get_latest_cape=CallStub(30.81),
+        )
+
+        return fred_client, market_client, shiller_client
+
+    @pytest.fixture(autouse=True)
+    def _patch_clients(self, mock_clients):
+        """Make every DataManager built in these tests use the stub clients."""
+        fred_client, market_client, shiller_client = mock_clients
+        with patch('src.data.data_manager.FREDClient', return_value=fred_client), \
+             patch('src.data.data_manager.MarketDataClient', return_value=market_client), \
+             patch('src.data.data_manager.ShillerDataClient', return_value=shiller_client):
+            yield
 
     def test_initialization(self, mock_config):
         """Test DataManager initialization."""
-        with patch('src.data.data_manager.FREDClient'), \
-             patch('src.data.data_manager.MarketDataClient'):
-            manager = DataManager(config=mock_config)
-            assert manager.config == mock_config
-            assert manager.fred_client is not None
-            assert manager.market_client is not None
-
-    def test_fetch_all_indicators_structure(self, mock_config, mock_clients):
-        """Test that fetch_all_indicators returns correct structure."""
-        fred_client, market_client = mock_clients
+        manager = DataManager(config=mock_config)
+        assert manager.config == mock_config
+        assert manager.fred_client is not None
+        assert manager.market_client is not None
 
-        with patch('src.data.data_manager.FREDClient', return_value=fred_client), \
-             patch('src.data.data_manager.MarketDataClient', return_value=market_client):
-            manager = DataManager(config=mock_config)
-            data = manager.fetch_all_indicators()
-
-            # Check top-level structure
-            assert 'recession' in data
-            assert 'credit' in data
-            assert 'valuation' in data
-            assert 'liquidity' in data
-            assert 'positioning' in data
-            assert 'metadata' in data
-
-            # Check metadata
-            assert 'fetch_timestamp' in data['metadata']
-            assert 'fetch_duration_seconds' in data['metadata']
+    def test_fetch_all_indicators_structure(self, mock_config):
+        """Test that fetch_all_indicators returns correct structure."""
+        manager = DataManager(config=mock_config)
+        data = manager.fetch_all_indicators()
+
+        # Check top-level structure
+        assert 'recession' in data
+        assert 'credit' in data
+        assert 'valuation' in data
+        assert 'liquidity' in data
+        assert 'positioning' in data
+        assert 'metadata' in data
+
+        # Check metadata
+        assert 'fetch_timestamp' in data['metadata']
+        assert 'fetch_duration_seconds' in data['metadata']
+
+    def test_fetch_all_indicators_prefetches_union_first(self, mock_config, mock_clients):
+        """Test that all FRED series are batch-fetched once before the categories run."""
+        fred_client, _, _ = mock_clients
+
+        manager = DataManager(config=mock_config)
+        manager.fetch_all_indicators()
+
+        # One batch for the union, none repeated per category
+        assert len(fred_client.get_multiple_series.calls) == 1
+        (first_batch,), _ = fred_client.get_multiple_series.calls[0]
+        all_ids = {series_id for specs in FRED_INDICATOR_SPECS.values() for _, series_id, _, _ in specs}
+        assert set(first_batch) == all_ids
+        assert len(first_batch) == len(all_ids)
+
+    def test_fetch_all_indicators_parallel(self, mock_config):
+        """Test that the five categories are fetched concurrently."""
+        categories = ['recession', 'credit', 'valuation', 'liquidity', 'positioning']
+        # Every fetcher must be in flight at once for the barrier to release
+        barrier = threading.Barrier(len(categories), timeout=5)
+
+        def make_fetcher(category):
+            def fetch():
+                barrier.wait()
+                return {f'{category}_indicator': 1.0}
+            return fetch
+
+        manager = DataManager(config=mock_config)
+        for category in categories:
+            setattr(manager, f'_fetch_{category}_indicators', make_fetcher(category))
+
+        data = manager.fetch_all_indicators()
+
+        for category in categories:
+            assert data[category] == {f'{category}_indicator': 1.0}
+
+    def test_fetch_all_indicators_as_of_parallel(self, mock_config):
+        """Test that historical fetches run the five categories concurrently too."""
+        categories = ['recession', 'credit', 'valuation', 'liquidity', 'positioning']
+        barrier = threading.Barrier(len(categories), timeout=5)
+
+        def make_fetcher(category):
+            def fetch(as_of_date):
+                barrier.wait()
+                return {f'{category}_indicator': as_of_date}
+            return fetch
+
+        manager = DataManager(config=mock_config)
+        for category in categories:
+            setattr(manager, f'_fetch_{category}_indicators_as_of', make_fetcher(category))
+
+        data = manager.fetch_all_indicators_as_of('2020-03-01')
+
+        for category in categories:
+            assert data[category] == {f'{category}_indicator': '2020-03-01'}
+        assert data['metadata']['as_of_date'] == '2020-03-01'
 
     def test_fetch_recession_indicators(self, mock_config, mock_clients):
         """Test fetching recession indicators."""
-        fred_client, market_client = mock_clients
+        fred_client, _, _ = mock_clients
 
-        with patch('src.data.data_manager.FREDClient', return_value=fred_client), \
-             patch('src.data.data_manager.MarketDataClient', return_value=market_client):
-            manager = DataManager(config=mock_config)
-            data = manager._fetch_recession_indicators()
+        manager = DataManager(config=mock_config)
+        data = manager._fetch_recession_indicators()
 
-            # Check expected keys
-            assert 'unemployment_claims' in data
-            assert 'ism_pmi' in data
-            assert 'yield_curve_10y2y' in data
-            assert 'consumer_sentiment' in data
+        # Check expected keys
+        assert 'unemployment_claims' in data
+        assert 'ism_pmi' in data
+        assert 'yield_curve_10y2y' in data
+        assert 'consumer_sentiment' in data
 
-            # Verify FRED client was called
-            assert fred_client.get_latest_value.called
-            assert fred_client.calculate_velocity.called
+        # Verify FRED client was called
+        assert fred_client.get_latest_value.called
+        assert fred_client.calculate_velocity.called
 
-    def test_fetch_credit_indicators(self, mock_config, mock_clients):
-        """Test fetching credit indicators."""
-        fred_client, market_client = mock_clients
+    @pytest.mark.parametrize('category', list(FRED_INDICATOR_SPECS))
+    def test_spec_driven_fetch_fills_every_key(self, mock_config, mock_clients, category):
+        """Test that each category fills every spec key without a batch fetch of its own."""
+        fred_client, _, _ = mock_clients
 
-        with patch('src.data.data_manager.FREDClient', return_value=fred_client), \
-             patch('src.data.data_manager.MarketDataClient', return_value=market_client):
-            manager = DataManager(config=mock_config)
-            data = manager._fetch_credit_indicators()
+        manager = DataManager(config=mock_config)
+        data = getattr(manager, f'_fetch_{category}_indicators')()
+
+        # Called on its own, the category fetcher pulls each series on demand rather than batching
+        assert fred_client.get_multiple_series.calls == []
+        assert all(key in data for key, _, _, _ in FRED_INDICATOR_SPECS[category])
+
+    def test_fetch_credit_indicators(self, mock_config):
+        """Test fetching credit indicators."""
+        manager = DataManager(config=mock_config)
+        data = manager._fetch_credit_indicators()
 
-            # Check expected keys
-            assert 'hy_spread' in data
-            assert 'hy_spread_velocity_20d' in data
-            assert 'ig_spread_bbb' in data
-            assert 'ted_spread' in data
+        # Check expected keys
+        assert 'hy_spread' in data
+        assert 'hy_spread_velocity_20d' in data
+        assert 'ig_spread_bbb' in data
+        assert 'ted_spread' in data
 
     def test_fetch_valuation_indicators(self, mock_config, mock_clients):
         """Test fetching valuation indicators."""
-        fred_client, market_client = mock_clients
+        fred_client, market_client, shiller_client = mock_clients
 
-        # Mock Shiller client
-        mock_shiller = MagicMock()
-        mock_shiller.get_latest_cape.return_value = 30.81
+        manager = DataManager(config=mock_config)
+        data = manager._fetch_valuation_indicators()
 
-        with patch('src.data.data_manager.FREDClient', return_value=fred_client), \
-             patch('src.data.data_manager.MarketDataClient', return_value=market_client), \
-             patch('src.data.data_manager.ShillerDataClient', return_value=mock_shiller):
-            manager = DataManager(config=mock_config)
-            data = manager._fetch_valuation_indicators()
-
-            # Check expected keys (updated for new structure)
-            assert 'sp500_price' in data
-            assert 'sp500_forward_pe' in data
-            assert 'shiller_cape' in data  # Changed from wilshire_5000
-            assert 'sp500_level' in data   # Added
-            assert 'gdp' in data
-
-            # Verify clients were called
-            assert fred_client.get_latest_value.called
-            assert market_client.get_forward_pe.called
-            assert mock_shiller.get_latest_cape.called
-
-    def test_fetch_liquidity_indicators(self, mock_config, mock_clients):
-        """Test fetching liquidity indicators."""
-        fred_client, market_client = mock_clients
+        # Check expected keys (updated for new structure)
+        assert 'sp500_price' in data
+        assert 'sp500_forward_pe' in data
+        assert 'shiller_cape' in data  # Changed from wilshire_5000
+        assert 'sp500_level' in data   # Added
+        assert 'gdp' in data
 
-        with patch('src.data.data_manager.FREDClient', return_value=fred_client), \
-             patch('src.data.data_manager.MarketDataClient', return_value=market_client):
-            manager = DataManager(config=mock_config)
-            data = manager._fetch_liquidity_indicators()
+        # Verify clients were called
+        assert fred_client.get_latest_value.called
+        assert market_client.get_forward_pe.called
+        assert shiller_client.get_latest_cape.called
+
+    def test_fetch_liquidity_indicators(self, mock_config):
+        """Test fetching liquidity indicators."""
+        manager = DataManager(config=mock_config)
+        data = manager._fetch_liquidity_indicators()
 
-            # Check expected keys
-            assert 'fed_funds_rate' in data
-            assert 'm2_money_supply' in data
-            assert 'vix' in data
+        # Check expected keys
+        assert 'fed_funds_rate' in data
+        assert 'm2_money_supply' in data
+        assert 'vix' in data
 
-    def test_fetch_positioning_indicators(self, mock_config, mock_clients):
+    def test_fetch_positioning_indicators(self, mock_config):
         """Test fetching positioning indicators (stubbed)."""
-        fred_client, market_client = mock_clients
-
-        with patch('src.data.data_manager.FREDClient', return_value=fred_client), \
-             patch('src.data.data_manager.MarketDataClient', return_value=market_client):
-            manager = DataManager(config=mock_config)
-            data = manager._fetch_positioning_indicators()
+        manager = DataManager(config=mock_config)
+        data = manager._fetch_positioning_indicators()
 
-            # CFTC data is stubbed, so should have None values
-            assert 'sp500_net_speculative' in data
-            assert data['sp500_net_speculative'] is None
+        # CFTC data is stubbed, so should have None values
+        assert 'sp500_net_speculative' in data
+        assert data['sp500_net_speculative'] is None
 
-            # But should have VIX proxy
-            assert 'vix_proxy' in data
+        # But should have VIX proxy
+        assert 'vix_proxy' in data
 
-    def test_graceful_failure_handling(self, mock_config):
+    def test_graceful_failure_handling(self, mock_config, mock_clients):
         """Test that DataManager continues even if some indicators fail."""
-        fred_client = MagicMock()
-        market_client = MagicMock()
+        # Make every client call return None (failure)
+        for client in mock_clients:
+            for stub in vars(client).values():
+                stub.return_value = None
 
-        # Make some calls return None (failure)
-        fred_client.get_latest_value.return_value = None
-        fred_client.get_moving_average.return_value = None
-        fred_client.calculate_velocity.return_value = None
-        market_client.get_sp500_price.return_value = None
-        market_client.get_vix.return_value = None
-        market_client.get_forward_pe.return_value = None
-
-        with patch('src.data.data_manager.FREDClient', return_value=fred_client), \
-             patch('src.data.data_manager.MarketDataClient', return_value=market_client):
-            manager = DataManager(config=mock_config)
+        manager = DataManager(config=mock_config)
 
-            # Should not raise, even with failures
-            data = manager.fetch_all_indicators()
+        # Should not raise, even with failures
+        data = manager.fetch_all_indicators()
 
-            # Should still return data structure
-            assert data is not None
-            assert 'recession' in data
-            assert 'metadata' in data
+        # Should still return data structure
+        assert data is not None
+        assert 'recession' in data
+        assert 'metadata' in data
 
-    def test_fetch_duration_tracking(self, mock_config, mock_clients):
+    def test_fetch_duration_tracking(self, mock_config):
         """Test that fetch duration is tracked."""
-        fred_client, market_client = mock_clients
+        manager = DataManager(config=mock_config)
+        data = manager.fetch_all_indicators()
 
-        with patch('src.data.data_manager.FREDClient', return_value=fred_client), \
-             patch('src.data.data_manager.MarketDataClient', return_value=market_client):
-            manager = DataManager(config=mock_config)
-            data = manager.fetch_all_indicators()
-
-            # Duration should be tracked
-            assert data['metadata']['fetch_duration_seconds'] >= 0
-            assert isinstance(data['metadata']['fetch_duration_seconds'], float)
+        # Duration should be tracked
+        assert data['metadata']['fetch_duration_seconds'] >= 0
+        assert isinstance(data['metadata']['fetch_duration_seconds'], float)
 
-    def test_log_fetch_summary(self, mock_config, mock_clients):
+    def test_log_fetch_summary(self, mock_config):
         """Test that fetch summary is logged."""
-        fred_client, market_client = mock_clients
-
-        # Mix of successful and failed fetches
-        fred_client.get_latest_value.side_effect = [100.0, None, 50.0, 75.0, None]
-
-        with patch('src.data.data_manager.FREDClient', return_value=fred_client), \
-             patch('src.data.data_manager.MarketDataClient', return_value=market_client):
-            manager = DataManager(config=mock_config)
+        manager = DataManager(config=mock_config)
 
-            # Create sample data with some None values
-            test_data = {
-                'recession': {'ind1': 100.0, 'ind2': None, 'ind3': 50.0},
-                'credit': {'ind4': None, 'ind5': 75.0}
-            }
+        # Create sample data with some None values
+        test_data = {
+            'recession': {'ind1': 100.0, 'ind2': None, 'ind3': 50.0},
+            'credit': {'ind4': None, 'ind5': 75.0}
+        }
 
-            # This should not raise
-            manager._log_fetch_summary(test_data)
+        # This should not raise
+        manager._log_fetch_summary(test_data)
 
-    def test_get_previous_value(self, mock_config):
+    def test_get_previous_value(self, mock_config, mock_clients):
         """Test getting previous value for detecting crosses."""
-        import pandas as pd
-
-        fred_client = MagicMock()
-        market_client = MagicMock()
+        fred_client, _, _ = mock_clients
 
         # Create sample series with multiple values
         dates = pd.date_range(start='2024-01-01', end='2024-01-10', freq='D')
-        series = pd.Series([45, 48, 51, 52, 49, 47, 50, 52, 51, 48], index=dates)
-        fred_client.get_series.return_value = series
+        fred_client.get_series.return_value = pd.Series(
+            [45, 48, 51, 52, 49, 47, 50, 52, 51, 48], index=dates
+        )
 
-        with patch('src.data.data_manager.FREDClient', return_value=fred_client), \
-             patch('src.data.data_manager.MarketDataClient', return_value=market_client):
-            manager = DataManager(config=mock_config)
+        manager = DataManager(config=mock_config)
 
-            # Get previous value (should be second to last)
-            prev_value = manager._get_previous_value('NAPM', periods_back=1)
+        # Get previous value (should be second to last)
+        prev_value = manager._get_previous_value('NAPM', periods_back=1)
 
-            assert prev_value == 51.0  # Second to last value
+        assert prev_value == 51.0  # Second to last value
 
-    def test_get_previous_value_insufficient_data(self, mock_config):
+    def test_get_previous_value_insufficient_data(self, mock_config, mock_clients):
         """Test getting previous value with insufficient data."""
-        import pandas as pd
-
-        fred_client = MagicMock()
-        market_client = MagicMock()
+        fred_client, _, _ = mock_clients
 
         # Create very short series
         dates = pd.date_range(start='2024-01-01', end='2024-01-02', freq='D')
-        series = pd.Series([50, 51], index=dates)
-        fred_client.get_series.return_value = series
+        fred_client.get_series.return_value = pd.Series([50, 51], index=dates)
 
-        with patch('src.data.data_manager.FREDClient', return_value=fred_client), \
-             patch('src.data.data_manager.MarketDataClient', return_value=market_client):
-            manager = DataManager(config=mock_config)
+        manager = DataManager(config=mock_config)
 
-            # Try to get value 5 periods back with only 2 data points
-            prev_value = manager._get_previous_value('NAPM', periods_back=5)
+        # Try to get value 5 periods back with only 2 data points
+        prev_value = manager._get_previous_value('NAPM', periods_back=5)
 
-            assert prev_value is None
+        assert prev_value is None
@@ -3,17 +3,24 @@ Unit tests for FRED Client
 """
 
 import pytest
-import tempfile
-import os
+import time
 from pathlib import Path
-from datetime import datetime, timedelta
 import pandas as pd
+import pyarrow.parquet as pq
 from unittest.mock import Mock, patch, MagicMock
 
-from src.data.fred_client import FREDClient
+from src.data.fred_client import FREDClient, Fred, CACHE_FETCHED_AT_KEY
 from src.config.config_manager import ConfigManager
 
 
+@pytest.fixture(scope="session")
+def sample_series_data():
+    """Create sample time series data (built once; tests only read it)."""
+    dates = pd.date_range(start='2020-01-01', end='2024-01-01', freq='D')
+    values = range(100, 100 + len(dates))
+    return pd.Series(values, index=dates, name='TEST_SERIES')
+
+
 class TestFREDClient:
     """Test suite for FRED Client."""
 
@@ -25,17 +32,9 @@ class TestFREDClient:
         return config
 
     @pytest.fixture
-    def temp_cache_dir(self):
-        """Create a temporary cache directory."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            yield tmpdir
-
-    @pytest.fixture
-    def sample_series_data(self):
-        """Create sample time series data."""
-        dates = pd.date_range(start='2020-01-01', end='2024-01-01', freq='D')
-        values = range(100, 100 + len(dates))
-        return pd.Series(values, index=dates, name='TEST_SERIES')
+    def temp_cache_dir(self, tmp_path_factory):
+        """Create a unique cache directory under pytest's session temp root."""
+        return str(tmp_path_factory.mktemp("fred_cache"))
 
     def test_initialization_with_valid_key(self, mock_config, temp_cache_dir):
         """Test initialization with valid API key."""
@@ -127,6 +126,23 @@ class TestFREDClient:
 
             assert result is None
 
+    def test_get_value_as_of(self, mock_config, temp_cache_dir):
+        """Test that get_value_as_of returns the last non-missing value on or before the date."""
+        dates = pd.date_range(start='2024-01-01', periods=6, freq='D')
+        series = pd.Series([1.0, 2.0, 3.0, float('nan'), 5.0, 6.0], index=dates)
+
+        with patch('src.data.fred_client.Fred') as mock_fred_class:
+            mock_fred = MagicMock()
+            mock_fred.get_series.return_value = series
+            mock_fred_class.return_value = mock_fred
+
+            client = FREDClient(config=mock_config, cache_dir=temp_cache_dir)
+
+            assert client.get_value_as_of('T10Y2Y', '2024-01-03') == 3.0
+            # NaN on the target date falls back to the previous observation
+            assert client.get_value_as_of('T10Y2Y', '2024-01-04') == 3.0
+            assert client.get_value_as_of('T10Y2Y', '2023-12-31') is None
+
     def test_calculate_velocity_yoy_pct(self, mock_config, temp_cache_dir):
         """Test YoY percent change velocity calculation."""
         # Create series with known values for easy testing
@@ -166,6 +182,24 @@ class TestFREDClient:
             # Should be approximately 1.0 (increase of 1 per day)
             assert 0.9 < velocity < 1.1
 
+    def test_calculate_velocity_pct_change(self, mock_config, temp_cache_dir):
+        """Test N-day percent change uses the last observation on or before the lookback date."""
+        # Weekly series: lookback of 10 days lands between observations
+        dates = pd.date_range(start='2024-01-07', periods=4, freq='W')
+        series = pd.Series([100.0, 110.0, 120.0, 150.0], index=dates)
+
+        with patch('src.data.fred_client.Fred') as mock_fred_class:
+            mock_fred = MagicMock()
+            mock_fred.get_series.return_value = series
+            mock_fred_class.return_value = mock_fred
+
+            client = FREDClient(config=mock_config, cache_dir=temp_cache_dir)
+            velocity = client.calculate_velocity('TEST', method='pct_change', lookback_days=10)
+
+            # Last date minus 10 days falls after the 2nd observation (110)
+            assert velocity == pytest.approx((150.0 - 110.0) / 110.0 * 100)
+            assert client.calculate_velocity('TEST', method='unknown') is None
+
     def test_calculate_velocity_insufficient_data(self, mock_config, temp_cache_dir):
         """Test velocity calculation with insufficient data."""
         # Very short series
@@ -201,6 +235,20 @@ class TestFREDClient:
             # Last 4 values: 70, 80, 90, 100 → average = 85
             assert ma == 85.0
 
+    def test_get_moving_average_skips_missing(self, mock_config, temp_cache_dir):
+        """Test that missing (NaN) observations are ignored in the moving average."""
+        dates = pd.date_range(start='2024-01-01', end='2024-01-04', freq='D')
+        series = pd.Series([10.0, 20.0, float('nan'), 30.0], index=dates)
+
+        with patch('src.data.fred_client.Fred') as mock_fred_class:
+            mock_fred = MagicMock()
+            mock_fred.get_series.return_value = series
+            mock_fred_class.return_value = mock_fred
+
+            client = FREDClient(config=mock_config, cache_dir=temp_cache_dir)
+
+            assert client.get_moving_average('TEST', window=3) == 25.0
+
     def test_cache_save_and_load(self, mock_config, temp_cache_dir, sample_series_data):
         """Test that data is cached and loaded correctly."""
         with patch('src.data.fred_client.Fred') as mock_fred_class:
@@ -223,12 +271,47 @@ class TestFREDClient:
             # Verify data is the same
             assert len(result1) == len(result2)
 
+    def test_memory_cache_skips_disk(self, mock_config, temp_cache_dir, sample_series_data):
+        """Test that repeat lookups are served from memory without touching disk."""
+        with patch('src.data.fred_client.Fred') as mock_fred_class:
+            mock_fred = MagicMock()
+            mock_fred.get_series.return_value = sample_series_data
+            mock_fred_class.return_value = mock_fred
+
+            client = FREDClient(config=mock_config, cache_dir=temp_cache_dir)
+            result1 = client.get_series('T10Y2Y', use_cache=True, cache_ttl_hours=24)
+
+            # Remove the disk copy; the in-memory entry should still answer
+            (Path(temp_cache_dir) / 'T10Y2Y.parquet').unlink()
+            result2 = client.get_series('T10Y2Y', use_cache=True, cache_ttl_hours=24)
+
+            assert mock_fred.get_series.call_count == 1
+            pd.testing.assert_series_equal(result1, result2)
+
+            # Callers get their own copy, so mutating a result doesn't poison the cache
+            result2.iloc[0] = -1.0
+            result3 = client.get_series('T10Y2Y', use_cache=True, cache_ttl_hours=24)
+            assert result3.iloc[0] == result1.iloc[0]
+
+    def test_memory_cache_evicts_least_recent(self, mock_config, temp_cache_dir, sample_series_data):
+        """Test that the in-memory cache is bounded and evicts the oldest entry."""
+        with patch('src.data.fred_client.Fred') as mock_fred_class:
+            mock_fred = MagicMock()
+            mock_fred.get_series.return_value = sample_series_data
+            mock_fred_class.return_value = mock_fred
+
+            client = FREDClient(config=mock_config, cache_dir=temp_cache_dir)
+            client.memory_cache_size = 2
+
+            client.get_series('A', use_cache=True)
+            client.get_series('B', use_cache=True)
+            client.get_series('A', use_cache=True)  # A becomes most recent
+            client.get_series('C', use_cache=True)  # evicts B
+
+            assert [key[0] for key in client._memory_cache] == ['A', 'C']
+
     def test_cache_expiry(self, mock_config, temp_cache_dir, sample_series_data):
         """Test that cache expiry logic works correctly."""
-        import time
-        from pathlib import Path
-        import platform
-
         with patch('src.data.fred_client.Fred') as mock_fred_class:
             mock_fred = MagicMock()
             mock_fred.get_series.return_value = sample_series_data
@@ -237,27 +320,53 @@ class TestFREDClient:
             client = FREDClient(config=mock_config, cache_dir=temp_cache_dir)
 
             # First call - should fetch and cache
-            result1 = client.get_series('T10Y2Y', use_cache=True, cache_ttl_hours=24)
+            client.get_series('T10Y2Y', use_cache=True, cache_ttl_hours=24)
             assert mock_fred.get_series.call_count == 1
 
-            # Find the cache file
-            cache_file = Path(temp_cache_dir) / 'fred' / 'T10Y2Y.csv'
+            cache_file = Path(temp_cache_dir) / 'T10Y2Y.parquet'
+            assert cache_file.exists()
 
-            if not cache_file.exists():
-                # On some systems (especially Windows in CI), caching might not work as expected
-                # Just verify the API was called
-                pytest.skip(f"Cache file not created at {cache_file}, skipping expiry test")
+            # Rewrite the stored fetch time to 25 hours ago (definitely expired)
+            table = pq.read_table(cache_file)
+            metadata = dict(table.schema.metadata)
+            metadata[CACHE_FETCHED_AT_KEY] = str(time.time() - 25 * 3600).encode()
+            pq.write_table(table.replace_schema_metadata(metadata), cache_file)
 
-            # Set modification time to 25 hours ago (definitely expired)
-            old_time = time.time() - (25 * 3600)  # 25 hours ago
-            os.utime(str(cache_file), (old_time, old_time))
-
-            # Second call - should fetch again due to expired cache
-            result2 = client.get_series('T10Y2Y', use_cache=True, cache_ttl_hours=24)
+            # Second call from a fresh client (no in-memory copy) - should fetch again
+            client = FREDClient(config=mock_config, cache_dir=temp_cache_dir)
+            client.get_series('T10Y2Y', use_cache=True, cache_ttl_hours=24)
 
             # Should have made 2 API calls (cache expired due to old timestamp)
             assert mock_fred.get_series.call_count == 2
 
+    def test_disk_hit_keeps_original_fetch_time(self, mock_config, temp_cache_dir, sample_series_data):
+        """Test that a series loaded from disk expires from memory with the file, not later."""
+        with patch('src.data.fred_client.Fred') as mock_fred_class:
+            mock_fred = MagicMock()
+            mock_fred.get_series.return_value = sample_series_data
+            mock_fred_class.return_value = mock_fred
+
+            client = FREDClient(config=mock_config, cache_dir=temp_cache_dir)
+            client.get_series('T10Y2Y', use_cache=True, cache_ttl_hours=24)
+
+            # Backdate the disk copy to 23 hours ago: still fresh, but only for another hour
+            cache_file = Path(temp_cache_dir) / 'T10Y2Y.parquet'
+            fetched_at = time.time() - 23 * 3600
+            table = pq.read_table(cache_file)
+            metadata = dict(table.schema.metadata)
+            metadata[CACHE_FETCHED_AT_KEY] = str(fetched_at).encode()
+            pq.write_table(table.replace_schema_metadata(metadata), cache_file)
+
+            client = FREDClient(config=mock_config, cache_dir=temp_cache_dir)
+            client.get_series('T10Y2Y', use_cache=True, cache_ttl_hours=24)
+            assert mock_fred.get_series.call_count == 1
+
+            stored_at, _ = client._memory_cache[('T10Y2Y', None, None)]
+            assert stored_at == pytest.approx(fetched_at)
+
+            # Once the file's age passes the TTL, the memory copy is stale too
+            assert client._get_from_memory(('T10Y2Y', None, None), ttl_hours=22) is None
+
     def test_get_multiple_series(self, mock_config, temp_cache_dir, sample_series_data):
         """Test fetching multiple series at once."""
         with patch('src.data.fred_client.Fred') as mock_fred_class:
@@ -273,6 +382,42 @@ class TestFREDClient:
             assert all(sid in results for sid in series_ids)
             assert mock_fred.get_series.call_count == 3
 
+    def test_get_multiple_series_skips_failures(self, mock_config, temp_cache_dir, sample_series_data):
+        """Test that failed series are omitted and duplicate IDs fetched once."""
+        def get_series(series_id, **kwargs):
+            if series_id == 'INVALID':
+                raise Exception("API Error")
+            return sample_series_data
+
+        with patch('src.data.fred_client.Fred') as mock_fred_class:
+            mock_fred = MagicMock()
+            mock_fred.get_series.side_effect = get_series
+            mock_fred_class.return_value = mock_fred
+
+            client = FREDClient(config=mock_config, cache_dir=temp_cache_dir)
+            results = client.get_multiple_series(['T10Y2Y', 'INVALID', 'T10Y2Y'])
+
+            assert list(results) == ['T10Y2Y']
+            assert mock_fred.get_series.call_count == 2
+
+    def test_rate_limit_allows_burst_then_throttles(self, mock_config, temp_cache_dir):
+        """Test that the token bucket lets a burst through and then paces requests."""
+        with patch('src.data.fred_client.Fred'):
+            client = FREDClient(config=mock_config, cache_dir=temp_cache_dir)
+
+        with patch('src.data.fred_client.time.sleep') as mock_sleep, \
+             patch('src.data.fred_client.time.monotonic', return_value=client._rate_limit_updated):
+            for _ in range(client.rate_limit_burst):
+                client._rate_limit()
+            assert not mock_sleep.called
+
+            client._rate_limit()
+            client._rate_limit()
+
+        waits = [call.args[0] for call in mock_sleep.call_args_list]
+        interval = 1 / client.requests_per_second
+        assert waits == pytest.approx([interval, 2 * interval])
+
     def test_error_handling(self, mock_config, temp_cache_dir):
         """Test that errors are handled gracefully."""
         with patch('src.data.fred_client.Fred') as mock_fred_class:
@@ -285,3 +430,81 @@ class TestFREDClient:
 
             # Should return None on error, not raise
             assert result is None
+
+
+class TestPooledFred:
+    """Test suite for the session-pooled fredapi client."""
+
+    OBSERVATIONS_JSON = (
+        b'{"observations": ['
+        b'{"date": "2024-01-01", "value": "1.5"},'
+        b'{"date": "2024-01-02", "value": "."}'
+        b']}'
+    )
+
+    def test_session_reused(self):
+        """Test that consecutive requests share one pooled session."""
+        fred = Fred(api_key='test_api_key_12345')
+        session = fred.session
+        session.get = Mock(return_value=Mock(ok=True, content=self.OBSERVATIONS_JSON))
+
+        fred.get_series('T10Y2Y')
+        series = fred.get_series('UNRATE', observation_start='2024-01-01')
+
+        assert session.get.call_count == 2
+        assert fred.session is session
+        params = session.get.call_args.kwargs['params']
+        assert params['series_id'] == 'UNRATE'
+        assert params['file_type'] == 'json'
+        assert params['observation_start'] == '2024-01-01'
+
+        assert list(series.index) == [pd.Timestamp('2024-01-01'), pd.Timestamp('2024-01-02')]
+        assert series.iloc[0] == 1.5
+        assert pd.isna(series.iloc[1])
+
+        adapter = session.get_adapter('https://api.stlouisfed.org/fred')
+        assert adapter.max_retries.total == 3
+
+    def test_error_response_raises(self):
+        """Test that FRED error payloads surface as ValueError."""
+        fred = Fred(api_key='test_api_key_12345')
+        fred.session.get = Mock(return_value=Mock(
+            ok=False,
+            content=b'{"error_code": 400, "error_message": "Bad Request. Series does not exist."}'
+        ))
+
+        with pytest.raises(ValueError, match='Series does not exist'):
+            fred.get_series('INVALID')
+
+    def test_other_requests_use_pooled_session(self):
+        """Test that non-observation fredapi calls also go through the pooled session."""
+        fred = Fred(api_key='test_api_key_12345')
+        fred.session.get = Mock(return_value=Mock(
+            ok=True,
+            content=b'<seriess><series id="T10Y2Y" title="10-Year Minus 2-Year" frequency="Daily"/></seriess>'
+        ))
+
+        info = fred.get_series_info('T10Y2Y')
+
+        assert info['id'] == 'T10Y2Y'
+        assert info['frequency'] == 'Daily'
+        url = fred.session.get.call_args.args[0]
+        assert 'series_id=T10Y2Y' in url
+        assert url.endswith('&api_key=test_api_key_12345')
+
+        fred.session.get = Mock(return_value=Mock(
+            ok=False,
+            status_code=400,
+            content=b'<error code="400" message="Bad Request. The series does not exist."/>'
+        ))
+        with pytest.raises(ValueError, match='series does not exist'):
+            fred.get_series_info('INVALID')
+
+    def test_non_json_error_response_raises(self):
+        """Test that an HTML or empty error body still raises ValueError with the HTTP status."""
+        fred = Fred(api_key='test_api_key_12345')
+
+        for content in (b'<html><body>502 Bad Gateway</body></html>', b''):
+            fred.session.get = Mock(return_value=Mock(ok=False, status_code=502, content=content))
+            with pytest.raises(ValueError, match='HTTP 502'):
+                fred.get_series('T10Y2Y')
@@ -5,7 +5,9 @@ Tests the full pipeline: Data Fetching → Scoring → Aggregation
 """
 
 import pytest
-from unittest.mock import Mock, MagicMock, patch
+from types import SimpleNamespace
+from unittest.mock import patch
+import numpy as np
 import pandas as pd
 
 from src.config.config_manager import ConfigManager
@@ -13,219 +15,260 @@ from src.data.data_manager import DataManager
 from src.scoring.aggregator import RiskAggregator
 
 
+# Shared date indexes for the synthetic series (DatetimeIndex is immutable)
+_DATES_2023 = pd.date_range(start='2023-01-01', end='2024-01-01', freq='D')
+_DATES_JAN2024 = pd.date_range(start='2024-01-01', end='2024-01-10', freq='D')
+
+
+@pytest.fixture(scope="module")
+def mock_fred_data():
+    """Create realistic mock FRED data (built once per module; tests only read it)."""
+    # Create sample time series
+    dates = _DATES_2023
+    n = len(dates)
+    steps = np.arange(n, dtype=np.float32)
+
+    # Synthetic series are small ramps and constants, so float32 (int32 for
+    # claims counts) holds them fine at half the memory
+    def const(value):
+        return np.full(n, value, dtype=np.float32)
+
+    def step_change(before, after, at):
+        return np.concatenate([const(before)[:at], const(after)[at:]])
+
+    return {
+        'ICSA': pd.Series(220000 + np.arange(n, dtype=np.int32) * 10, index=dates),  # Rising claims
+        'NAPM': pd.Series(step_change(52.0, 48.0, 200), index=dates),  # PMI crosses below 50
+        'T10Y2Y': pd.Series(step_change(0.3, -0.2, 100), index=dates),  # Inverts
+        'T10Y3M': pd.Series(const(0.5), index=dates),
+        'UMCSENT': pd.Series(const(85.0), index=dates),
+        'BAMLH0A0HYM2': pd.Series(400 + steps * 0.5, index=dates),  # Rising spreads
+        'BAMLC0A4CBBB': pd.Series(const(150.0), index=dates),
+        'TEDRATE': pd.Series(const(0.4), index=dates),
+        'DRTSCILM': pd.Series(const(10.0), index=dates),
+        'WILL5000IND': pd.Series(const(45000.0), index=dates),
+        'GDP': pd.Series(const(28000.0), index=dates),
+        'DFF': pd.Series(5.0 + steps * 0.01, index=dates),  # Rising rates
+        'M2SL': pd.Series(const(21000.0), index=dates),
+        'WALCL': pd.Series(const(8000.0), index=dates),
+    }
+
+
+# High-risk scenario: latest values and velocities by FRED series ID
+_HIGH_RISK_LATEST = {
+    'ICSA': 280000,  # High claims
+    'MANEMP': 12500,  # Manufacturing employment (ISM proxy)
+    'T10Y2Y': -0.8,  # Deep inversion
+    'T10Y3M': -0.5,
+    'UMCSENT': 68.0,  # Low confidence
+    'BAMLH0A0HYM2': 850,  # Wide spreads
+    'BAMLC0A4CBBB': 400,
+    'TEDRATE': 2.0,  # Stress
+    'DRTSCILM': 35.0,  # Tight lending
+    'SP500': 4200.0,  # S&P 500 from FRED
+    'GDP': 28000,
+    'DFF': 5.5,
+    'M2SL': 20000,
+    'WALCL': 7500,
+    'VIXCLS': 38.0,  # VIX from FRED
+    'UNRATE': 4.5,
+}
+
+_HIGH_RISK_VELOCITY = {
+    'ICSA': 18.0,  # Spiking claims
+    'BAMLH0A0HYM2': 12.0,  # Widening spreads
+    'DFF': 2.2,  # Rapid tightening
+    'M2SL': -1.5,  # Contracting money supply
+}
+
+
+# Risk tiers from lowest to highest
+_TIER_ORDER = ['GREEN', 'YELLOW', 'RED']
+
+# Indicator keys each scorer relies on, per DataManager category
+_REQUIRED_INDICATORS = {
+    'recession': frozenset({'unemployment_claims_velocity_yoy', 'ism_pmi', 'yield_curve_10y2y'}),
+    'credit': frozenset({'hy_spread', 'hy_spread_velocity_20d'}),
+    'valuation': frozenset({'sp500_price', 'shiller_cape', 'gdp'}),  # Updated from wilshire_5000
+}
+
+
+def _build_fred_mock(latest, velocity, moving_average, series):
+    """
+    Build a FRED client stub from lookup functions.
+
+    Plain namespaces rather than MagicMock: these tests never inspect call
+    history, so there's no need to pay for call recording on every lookup.
+
+    Args:
+        latest: get_latest_value(series_id)
+        velocity: calculate_velocity(series_id, method=..., lookback_days=...)
+        moving_average: get_moving_average(series_id, window=...)
+        series: get_series(series_id, **kwargs)
+    """
+    return SimpleNamespace(
+        get_latest_value=latest,
+        calculate_velocity=velocity,
+        get_moving_average=moving_average,
+        get_series=series,
+        get_multiple_series=lambda series_ids: {},  # Prefetch is a no-op
+    )
+
+
+def _build_market_mock(sp500_price, vix, forward_pe):
+    """Build a market data client stub with fixed quotes."""
+    return SimpleNamespace(
+        get_sp500_price=lambda *args, **kwargs: sp500_price,
+        get_vix=lambda *args, **kwargs: vix,
+        get_forward_pe=lambda *args, **kwargs: forward_pe,
+    )
+
+
 class TestEndToEndIntegration:
     """Test full end-to-end data flow."""
 
-    @pytest.fixture
-    def mock_fred_data(self):
-        """Create realistic mock FRED data."""
-        # Create sample time series
-        dates = pd.date_range(start='2023-01-01', end='2024-01-01', freq='D')
-
-        return {
-            'ICSA': pd.Series([220000 + i*10 for i in range(len(dates))], index=dates),  # Rising claims
-            'NAPM': pd.Series([52.0] * 200 + [48.0] * (len(dates)-200), index=dates),  # PMI crosses below 50
-            'T10Y2Y': pd.Series([0.3] * 100 + [-0.2] * (len(dates)-100), index=dates),  # Inverts
-            'T10Y3M': pd.Series([0.5] * len(dates), index=dates),
-            'UMCSENT': pd.Series([85.0] * len(dates), index=dates),
-            'BAMLH0A0HYM2': pd.Series([400 + i*0.5 for i in range(len(dates))], index=dates),  # Rising spreads
-            'BAMLC0A4CBBB': pd.Series([150.0] * len(dates), index=dates),
-            'TEDRATE': pd.Series([0.4] * len(dates), index=dates),
-            'DRTSCILM': pd.Series([10.0] * len(dates), index=dates),
-            'WILL5000IND': pd.Series([45000.0] * len(dates), index=dates),
-            'GDP': pd.Series([28000.0] * len(dates), index=dates),
-            'DFF': pd.Series([5.0 + i*0.01 for i in range(len(dates))], index=dates),  # Rising rates
-            'M2SL': pd.Series([21000.0] * len(dates), index=dates),
-            'WALCL': pd.Series([8000.0] * len(dates), index=dates),
-        }
-
     @pytest.fixture
     def mock_clients(self, mock_fred_data):
         """Create mock data clients with realistic data."""
-        fred_client = MagicMock()
-        market_client = MagicMock()
+        # Raw values per series, so the lookups below index numpy arrays directly
+        values = {series_id: series.to_numpy() for series_id, series in mock_fred_data.items()}
+
+        # (past, current) pairs for the default 365-day YoY lookback, computed once
+        yoy_pairs = {
+            series_id: (series[len(series) - 365], series[-1])
+            for series_id, series in values.items()
+            if len(series) >= 365
+        }
 
         # Setup FRED client responses
         def get_series(series_id, **kwargs):
             return mock_fred_data.get(series_id)
 
         def get_latest_value(series_id):
-            series = mock_fred_data.get(series_id)
-            return float(series.iloc[-1]) if series is not None else None
+            series = values.get(series_id)
+            return float(series[-1]) if series is not None else None
 
         def get_moving_average(series_id, window=4):
-            series = mock_fred_data.get(series_id)
+            series = values.get(series_id)
             if series is not None and len(series) >= window:
-                return float(series.iloc[-window:].mean())
+                return float(series[-window:].mean())
             return None
 
         def calculate_velocity(series_id, method='yoy_pct', lookback_days=365):
-            series = mock_fred_data.get(series_id)
+            if method == 'yoy_pct' and lookback_days == 365:
+                if series_id not in yoy_pairs:
+                    return None
+                past, current = yoy_pairs[series_id]
+                return float((current - past) / past * 100)
+
+            series = values.get(series_id)
             if series is None or len(series) < lookback_days:
                 return None
 
+            current = series[-1]
+            past = series[max(0, len(series) - lookback_days)]
             if method == 'yoy_pct':
-                current = series.iloc[-1]
-                past_idx = max(0, len(series) - lookback_days)
-                past = series.iloc[past_idx]
                 return float((current - past) / past * 100)
             elif method == 'rate':
-                current = series.iloc[-1]
-                past_idx = max(0, len(series) - lookback_days)
-                past = series.iloc[past_idx]
-                actual_days = lookback_days
-                return float((current - past) / actual_days)
+                return float((current - past) / lookback_days)
             return None
 
-        fred_client.get_series.side_effect = get_series
-        fred_client.get_latest_value.side_effect = get_latest_value
-        fred_client.get_moving_average.side_effect = get_moving_average
-        fred_client.calculate_velocity.side_effect = calculate_velocity
-
-        # Setup market client responses
-        market_client.get_sp500_price.return_value = 4500.0
-        market_client.get_vix.return_value = 16.0
-        market_client.get_forward_pe.return_value = 20.0
+        fred_client = _build_fred_mock(
+            latest=get_latest_value,
+            velocity=calculate_velocity,
+            moving_average=get_moving_average,
+            series=get_series
+        )
+        market_client = _build_market_mock(sp500_price=4500.0, vix=16.0, forward_pe=20.0)
 
         return fred_client, market_client
 
-    def test_full_pipeline_normal_conditions(self, mock_clients):
-        """Test complete pipeline with normal market conditions."""
-        fred_client, market_client = mock_clients
+    @pytest.fixture
+    def mock_shiller(self):
+        """Create a mock Shiller client so no test touches the shared CAPE cache."""
+        return SimpleNamespace(get_latest_cape=lambda: 30.81)
 
-        with patch('src.data.data_manager.FREDClient', return_value=fred_client), \
-             patch('src.data.data_manager.MarketDataClient', return_value=market_client):
-
-            # Step 1: Fetch all data
-            data_manager = DataManager()
-            all_data = data_manager.fetch_all_indicators()
-
-            # Verify data was fetched
-            assert all_data is not None
-            assert 'recession' in all_data
-            assert 'credit' in all_data
-            assert 'valuation' in all_data
-            assert 'liquidity' in all_data
-            assert 'positioning' in all_data
-
-            # Step 2: Calculate risk scores
-            aggregator = RiskAggregator()
-            result = aggregator.calculate_overall_risk(all_data)
-
-            # Verify results structure
-            assert 'overall_score' in result
-            assert 'tier' in result
-            assert 'dimension_scores' in result
-            assert result['tier'] in ['GREEN', 'YELLOW', 'RED']
-
-            # Verify all dimensions were scored
-            assert len(result['dimension_scores']) == 5
-            assert 'recession' in result['dimension_scores']
-            assert 'credit' in result['dimension_scores']
-            assert 'valuation' in result['dimension_scores']
-            assert 'liquidity' in result['dimension_scores']
-            assert 'positioning' in result['dimension_scores']
-
-            # Verify overall score is in valid range
-            assert 0 <= result['overall_score'] <= 10
-
-            # Verify weighted calculation (allowing for re-normalized weights when dimensions are missing)
-            # The aggregator may exclude dimensions with no data and re-normalize weights
-            manual_calc = sum(
-                result['dimension_scores'][dim] * result['weights'][dim]
-                for dim in result['dimension_scores']
+    @pytest.fixture
+    def patched_env(self, mock_clients, mock_shiller):
+        """
+        Patch DataManager's data clients for the whole test.
+
+        Yields a namespace holding the stubs DataManager will receive
+        (fred, market, shiller); reassign them before creating a
+        DataManager to swap in scenario-specific clients.
+        """
+        fred_client, market_client = mock_clients
+        env = SimpleNamespace(fred=fred_client, market=market_client, shiller=mock_shiller)
+
+        patchers = [
+            patch('src.data.data_manager.FREDClient', side_effect=lambda *args, **kwargs: env.fred),
+            patch('src.data.data_manager.MarketDataClient', side_effect=lambda *args, **kwargs: env.market),
+            patch('src.data.data_manager.ShillerDataClient', side_effect=lambda *args, **kwargs: env.shiller),
+        ]
+        for patcher in patchers:
+            patcher.start()
+        yield env
+        for patcher in patchers:
+            patcher.stop()
+
+    def _apply_scenario(self, scenario, env):
+        """Configure the patched clients for a pipeline scenario."""
+        if scenario == 'high_risk':
+            # Previous PMI for cross detection
+            pmi_series = pd.Series([52.0] * 5 + [46.0] * 5, index=_DATES_JAN2024)
+
+            env.fred = _build_fred_mock(
+                latest=_HIGH_RISK_LATEST.get,
+                velocity=lambda series_id, **kwargs: _HIGH_RISK_VELOCITY.get(series_id, 0.0),
+                moving_average=lambda series_id, **kwargs: 275000,
+                series=lambda series_id, **kwargs: pmi_series
             )
-            # Allow up to 0.5 point difference due to re-normalization and signal adjustments
-            assert abs(manual_calc - result['overall_score']) < 0.5
+            env.market = _build_market_mock(sp500_price=4200.0, vix=38.0, forward_pe=26.0)  # High fear, rich multiple
+            env.shiller.get_latest_cape = lambda: 35.0  # Expensive
+        elif scenario == 'missing':
+            # Make some data return None
+            env.fred.get_latest_value = lambda x: None if x == 'UMCSENT' else 100.0
+            env.fred.calculate_velocity = lambda *args, **kwargs: None
+
+    # Tier thresholds from config: YELLOW=4.0, RED=5.0. Historical max is 5.55
+    # (April 2020), so high-risk scenarios typically land in the 4-6 range.
+    @pytest.mark.parametrize('scenario, expected_tier_min, min_score, min_signals', [
+        ('normal', 'GREEN', 0.0, 0),
+        ('missing', 'GREEN', 0.0, 0),
+        ('high_risk', 'YELLOW', 4.0, 4),  # Score itself at the YELLOW threshold, not just the tier
+    ])
+    def test_pipeline_scenarios(self, scenario, expected_tier_min, min_score, min_signals, patched_env):
+        """Test the full pipeline (fetch -> score -> aggregate) across market scenarios."""
+        self._apply_scenario(scenario, patched_env)
+
+        # Step 1: Fetch all data
+        data_manager = DataManager()
+        all_data = data_manager.fetch_all_indicators()
+
+        # Verify data was fetched
+        assert all_data is not None
+        assert {'recession', 'credit', 'valuation', 'liquidity', 'positioning'} <= all_data.keys()
+
+        # Step 2: Calculate risk scores
+        aggregator = RiskAggregator()
+        result = aggregator.calculate_overall_risk(all_data)
 
-    def test_pipeline_with_missing_data(self, mock_clients):
-        """Test pipeline handles missing data gracefully."""
-        fred_client, market_client = mock_clients
+        # Verify results structure: all dimensions scored, score in range
+        assert set(result['dimension_scores']) == {'recession', 'credit', 'valuation', 'liquidity', 'positioning'}
+        assert result['tier'] in _TIER_ORDER
+        assert 0 <= result['overall_score'] <= 10
 
-        # Make some data return None
-        fred_client.get_latest_value.side_effect = lambda x: None if x == 'UMCSENT' else 100.0
-        fred_client.calculate_velocity.return_value = None
-
-        with patch('src.data.data_manager.FREDClient', return_value=fred_client), \
-             patch('src.data.data_manager.MarketDataClient', return_value=market_client):
-
-            data_manager = DataManager()
-            all_data = data_manager.fetch_all_indicators()
-
-            aggregator = RiskAggregator()
-            result = aggregator.calculate_overall_risk(all_data)
-
-            # Should still produce a result
-            assert result is not None
-            assert 'overall_score' in result
-            assert 0 <= result['overall_score'] <= 10
-
-    def test_pipeline_high_risk_scenario(self):
-        """Test pipeline with high-risk market conditions."""
-        fred_client = MagicMock()
-        market_client = MagicMock()
-
-        # Setup high-risk data
-        fred_client.get_latest_value.side_effect = lambda x: {
-            'ICSA': 280000,  # High claims
-            'MANEMP': 12500,  # Manufacturing employment (ISM proxy)
-            'T10Y2Y': -0.8,  # Deep inversion
-            'T10Y3M': -0.5,
-            'UMCSENT': 68.0,  # Low confidence
-            'BAMLH0A0HYM2': 850,  # Wide spreads
-            'BAMLC0A4CBBB': 400,
-            'TEDRATE': 2.0,  # Stress
-            'DRTSCILM': 35.0,  # Tight lending
-            'SP500': 4200.0,  # S&P 500 from FRED
-            'GDP': 28000,
-            'DFF': 5.5,
-            'M2SL': 20000,
-            'WALCL': 7500,
-            'VIXCLS': 38.0,  # VIX from FRED
-            'UNRATE': 4.5,
-        }.get(x)
-
-        fred_client.get_moving_average.return_value = 275000
-        fred_client.calculate_velocity.side_effect = lambda series_id, **kwargs: {
-            'ICSA': 18.0,  # Spiking claims
-            'BAMLH0A0HYM2': 12.0,  # Widening spreads
-            'DFF': 2.2,  # Rapid tightening
-            'M2SL': -1.5,  # Contracting money supply
-        }.get(series_id, 0.0)
-
-        # Previous PMI for cross detection
-        dates = pd.date_range(start='2024-01-01', end='2024-01-10', freq='D')
-        pmi_series = pd.Series([52.0] * 5 + [46.0] * 5, index=dates)
-        fred_client.get_series.return_value = pmi_series
-
-        market_client.get_sp500_price.return_value = 4200.0
-        market_client.get_vix.return_value = 38.0  # High fear
-        market_client.get_forward_pe.return_value = 26.0
-
-        # Mock Shiller client for high valuation
-        mock_shiller = MagicMock()
-        mock_shiller.get_latest_cape.return_value = 35.0  # Expensive
-
-        with patch('src.data.data_manager.FREDClient', return_value=fred_client), \
-             patch('src.data.data_manager.MarketDataClient', return_value=market_client), \
-             patch('src.data.data_manager.ShillerDataClient', return_value=mock_shiller):
-
-            data_manager = DataManager()
-            all_data = data_manager.fetch_all_indicators()
-
-            aggregator = RiskAggregator()
-            result = aggregator.calculate_overall_risk(all_data)
-
-            # Should be high risk (using realistic calibrated thresholds: YELLOW=4.0, RED=5.0)
-            # Historical max is 5.55 (April 2020), so high-risk scenarios are typically 4-6
-            assert result['overall_score'] >= 4.0  # At least YELLOW threshold
-            assert result['overall_score'] < 10.0  # Sanity check
-            # Should be elevated risk
-            assert result['overall_score'] > 3.5  # Significantly elevated
-
-            # Should have multiple signals
-            total_signals = sum(len(signals) for signals in result['all_signals'].values())
-            assert total_signals > 3  # At least a few warning signals
+        # Verify weighted calculation over the dimensions that had data
+        # (the aggregator excludes empty dimensions and re-normalizes weights)
+        weights = result['normalized_weights']
+        manual_calc = sum(result['dimension_scores'][dim] * weights[dim] for dim in weights)
+        assert abs(manual_calc - result['overall_score']) < 0.5
+
+        # Scenario expectations
+        assert _TIER_ORDER.index(result['tier']) >= _TIER_ORDER.index(expected_tier_min)
+        # The liquidity override can lift the tier alone, so check the score too
+        assert result['overall_score'] >= min_score
+        assert result['metadata']['total_signals'] >= min_signals
 
     def test_config_integration(self):
         """Test that config properly flows through entire system."""
@@ -248,95 +291,57 @@ class TestEndToEndIntegration:
         assert 'yellow_threshold' in thresholds
         assert 'red_threshold' in thresholds
 
-    def test_data_to_score_consistency(self, mock_clients):
+    def test_data_to_score_consistency(self, patched_env):
         """Test that data keys match what scorers expect."""
-        fred_client, market_client = mock_clients
-
-        # Mock Shiller client
-        mock_shiller = MagicMock()
-        mock_shiller.get_latest_cape.return_value = 30.81
-
-        with patch('src.data.data_manager.FREDClient', return_value=fred_client), \
-             patch('src.data.data_manager.MarketDataClient', return_value=market_client), \
-             patch('src.data.data_manager.ShillerDataClient', return_value=mock_shiller):
-
-            data_manager = DataManager()
-            all_data = data_manager.fetch_all_indicators()
-
-            # Check recession data keys
-            recession_keys = all_data['recession'].keys()
-            required_recession = [
-                'unemployment_claims_velocity_yoy',
-                'ism_pmi',
-                'yield_curve_10y2y'
-            ]
-            for key in required_recession:
-                assert key in recession_keys, f"Missing recession indicator: {key}"
-
-            # Check credit data keys
-            credit_keys = all_data['credit'].keys()
-            required_credit = ['hy_spread', 'hy_spread_velocity_20d']
-            for key in required_credit:
-                assert key in credit_keys, f"Missing credit indicator: {key}"
-
-            # Check valuation data keys (updated for new structure)
-            valuation_keys = all_data['valuation'].keys()
-            required_valuation = ['sp500_price', 'shiller_cape', 'gdp']  # Updated from wilshire_5000
-            for key in required_valuation:
-                assert key in valuation_keys, f"Missing valuation indicator: {key}"
-
-    def test_score_range_validation(self, mock_clients):
-        """Test that all scores are within valid 0-10 range."""
-        fred_client, market_client = mock_clients
+        data_manager = DataManager()
+        all_data = data_manager.fetch_all_indicators()
 
-        with patch('src.data.data_manager.FREDClient', return_value=fred_client), \
-             patch('src.data.data_manager.MarketDataClient', return_value=market_client):
+        for category, required in _REQUIRED_INDICATORS.items():
+            missing = required - all_data[category].keys()
+            assert not missing, f"Missing {category} indicators: {sorted(missing)}"
 
-            data_manager = DataManager()
-            all_data = data_manager.fetch_all_indicators()
+    def test_score_range_validation(self, patched_env):
+        """Test that all scores are within valid 0-10 range."""
+        data_manager = DataManager()
+        all_data = data_manager.fetch_all_indicators()
 
-            aggregator = RiskAggregator()
-            result = aggregator.calculate_overall_risk(all_data)
+        aggregator = RiskAggregator()
+        result = aggregator.calculate_overall_risk(all_data)
 
-            # Check all dimension scores are in range
-            for dim, score in result['dimension_scores'].items():
-                assert 0 <= score <= 10, f"{dim} score out of range: {score}"
+        # Check all dimension scores are in range
+        for dim, score in result['dimension_scores'].items():
+            assert 0 <= score <= 10, f"{dim} score out of range: {score}"
 
-            # Check overall score is in range
-            assert 0 <= result['overall_score'] <= 10
+        # Check overall score is in range
+        assert 0 <= result['overall_score'] <= 10
 
-            # Check tier matches score
-            if result['overall_score'] >= 8.0:
-                assert result['tier'] == 'RED'
-            elif result['overall_score'] >= 6.5:
-                assert result['tier'] == 'YELLOW'
-            else:
-                assert result['tier'] == 'GREEN'
+        # Check tier matches score
+        if result['overall_score'] >= 8.0:
+            assert result['tier'] == 'RED'
+        elif result['overall_score'] >= 6.5:
+            assert result['tier'] == 'YELLOW'
+        else:
+            assert result['tier'] == 'GREEN'
 
-    def test_metadata_completeness(self, mock_clients):
+    def test_metadata_completeness(self, patched_env):
         """Test that all expected metadata is present."""
-        fred_client, market_client = mock_clients
+        data_manager = DataManager()
+        all_data = data_manager.fetch_all_indicators()
 
-        with patch('src.data.data_manager.FREDClient', return_value=fred_client), \
-             patch('src.data.data_manager.MarketDataClient', return_value=market_client):
+        # Check data metadata
+        assert 'metadata' in all_data
+        assert 'fetch_timestamp' in all_data['metadata']
+        assert 'fetch_duration_seconds' in all_data['metadata']
 
-            data_manager = DataManager()
-            all_data = data_manager.fetch_all_indicators()
-
-            # Check data metadata
-            assert 'metadata' in all_data
-            assert 'fetch_timestamp' in all_data['metadata']
-            assert 'fetch_duration_seconds' in all_data['metadata']
-
-            # Check scoring metadata
-            aggregator = RiskAggregator()
-            result = aggregator.calculate_overall_risk(all_data)
+        # Check scoring metadata
+        aggregator = RiskAggregator()
+        result = aggregator.calculate_overall_risk(all_data)
 
-            assert 'metadata' in result
-            assert 'weighted_calculation' in result['metadata']
-            # May be 4 or 5 depending on whether positioning has data (often excluded in mocks)
-            assert len(result['metadata']['weighted_calculation']) >= 4
-            assert len(result['metadata']['weighted_calculation']) <= 5
+        assert 'metadata' in result
+        assert 'weighted_calculation' in result['metadata']
+        # May be 4 or 5 depending on whether positioning has data (often excluded in mocks)
+        assert len(result['metadata']['weighted_calculation']) >= 4
+        assert len(result['metadata']['weighted_calculation']) <= 5
 
 
 class TestComponentInteraction:
@@ -2,13 +2,53 @@
 Unit tests for Market Data Client (Yahoo Finance)
 """
 
+import threading
+import time
+
 import pytest
+import pyarrow.parquet as pq
 from unittest.mock import Mock, patch, MagicMock
 from pathlib import Path
-from datetime import datetime, timedelta
+import numpy as np
 import pandas as pd
 
-from src.data.market_data import MarketDataClient
+from src.data.market_data import MarketDataClient, CACHE_FETCHED_AT_KEY, FORWARD_PE_TTL_SECONDS
+
+
+@pytest.fixture(scope="session")
+def mock_ticker_data():
+    """Create mock ticker historical data (shared; tests must not mutate it)."""
+    dates = pd.date_range('2024-01-01', periods=100, freq='D')
+    base = np.arange(100, dtype=np.float64)
+    data = pd.DataFrame({
+        'Open': 4500 + base,
+        'High': 4550 + base,
+        'Low': 4450 + base,
+        'Close': 4500 + base,
+        'Volume': np.full(100, 1_000_000, dtype=np.int32)
+    }, index=dates)
+    return data
+
+
+@pytest.fixture(scope="session")
+def sector_data():
+    """Create 3-month price data per sector ETF (defensive up, cyclical down)."""
+    def create_sector_data(start_price, end_price):
+        dates = pd.date_range('2024-01-01', periods=90, freq='D')
+        return pd.DataFrame({
+            'Close': np.linspace(start_price, end_price, 90),
+            'Volume': np.full(90, 1_000_000, dtype=np.int32)
+        }, index=dates)
+
+    # Defensive sectors up, cyclical down (risk-off)
+    return {
+        'XLV': create_sector_data(100, 110),  # Healthcare +10%
+        'XLP': create_sector_data(100, 108),  # Staples +8%
+        'XLU': create_sector_data(100, 106),  # Utilities +6%
+        'XLY': create_sector_data(100, 95),   # Discretionary -5%
+        'XLI': create_sector_data(100, 97),   # Industrials -3%
+        'XLF': create_sector_data(100, 94),   # Financials -6%
+    }
 
 
 class TestMarketDataClient:
@@ -27,18 +67,12 @@ class TestMarketDataClient:
         with patch('src.data.market_data.ConfigManager'):
             return MarketDataClient(cache_dir=str(temp_cache_dir))
 
-    @pytest.fixture
-    def mock_ticker_data(self):
-        """Create mock ticker historical data."""
-        dates = pd.date_range('2024-01-01', periods=100, freq='D')
-        data = pd.DataFrame({
-            'Open': [4500 + i for i in range(100)],
-            'High': [4550 + i for i in range(100)],
-            'Low': [4450 + i for i in range(100)],
-            'Close': [4500 + i for i in range(100)],
-            'Volume': [1000000] * 100
-        }, index=dates)
-        return data
+    @pytest.fixture(autouse=True)
+    def mock_ticker(self):
+        """Patch yf.Ticker so every symbol gets this reconfigurable stub."""
+        ticker = Mock()
+        with patch('yfinance.Ticker', return_value=ticker):
+            yield ticker
 
     def test_initialization(self, temp_cache_dir):
         """Test MarketDataClient initialization."""
@@ -60,196 +94,207 @@ class TestMarketDataClient:
             with pytest.raises(ImportError, match="yfinance library not installed"):
                 MarketDataClient(cache_dir=str(temp_cache_dir))
 
-    def test_get_ticker_data_success(self, market_client, mock_ticker_data):
+    def test_get_ticker_data_success(self, market_client, mock_ticker, mock_ticker_data):
         """Test fetching ticker data successfully."""
-        mock_ticker = Mock()
         mock_ticker.history.return_value = mock_ticker_data
 
-        with patch('yfinance.Ticker', return_value=mock_ticker):
-            data = market_client.get_ticker_data('^GSPC', period='1y', use_cache=False)
+        data = market_client.get_ticker_data('^GSPC', period='1y', use_cache=False)
 
-            assert data is not None
-            assert len(data) == 100
-            assert 'Close' in data.columns
-            mock_ticker.history.assert_called_once_with(period='1y')
+        assert data is not None
+        assert len(data) == 100
+        assert 'Close' in data.columns
+        mock_ticker.history.assert_called_once_with(period='1y')
+        # Column reductions read contiguous memory
+        assert data['Close'].to_numpy().flags.c_contiguous
+        # Prices keep full precision; only Volume is narrowed
+        assert data['Close'].dtype == np.float64
+        assert data['Volume'].dtype.itemsize <= 4
 
-    def test_get_ticker_data_with_caching(self, market_client, mock_ticker_data):
+    def test_get_ticker_data_with_caching(self, market_client, mock_ticker, mock_ticker_data):
         """Test ticker data caching mechanism."""
-        mock_ticker = Mock()
         mock_ticker.history.return_value = mock_ticker_data
 
-        with patch('yfinance.Ticker', return_value=mock_ticker):
-            # First call - should fetch from API
-            data1 = market_client.get_ticker_data('^GSPC', period='1y', use_cache=True)
-            assert data1 is not None
-            assert mock_ticker.history.call_count == 1
+        # First call - should fetch from API
+        data1 = market_client.get_ticker_data('^GSPC', period='1y', use_cache=True)
+        assert data1 is not None
+        assert mock_ticker.history.call_count == 1
 
-            # Second call - should use cache
-            data2 = market_client.get_ticker_data('^GSPC', period='1y', use_cache=True, cache_ttl_hours=24)
-            assert data2 is not None
-            # history() should still be called only once (cached)
-            assert mock_ticker.history.call_count == 1
+        # Second call - should use cache
+        data2 = market_client.get_ticker_data('^GSPC', period='1y', use_cache=True, cache_ttl_hours=24)
+        assert data2 is not None
+        # history() should still be called only once (cached)
+        assert mock_ticker.history.call_count == 1
 
-    def test_get_ticker_data_cache_expiry(self, market_client, mock_ticker_data):
-        """Test that expired cache is refreshed."""
-        mock_ticker = Mock()
+    def test_ticker_object_reused_per_symbol(self, market_client, mock_ticker, mock_ticker_data):
+        """Test that one yf.Ticker is created per symbol and shared across calls."""
         mock_ticker.history.return_value = mock_ticker_data
+        mock_ticker.info = {'forwardPE': 19.5}
 
-        with patch('yfinance.Ticker', return_value=mock_ticker):
-            # First call - populate cache
-            data1 = market_client.get_ticker_data('^GSPC', period='1y', use_cache=True)
-            assert data1 is not None
+        with patch('yfinance.Ticker', return_value=mock_ticker) as mock_ticker_class:
+            market_client.get_ticker_data('^GSPC', period='1y', use_cache=False)
+            market_client.get_latest_price('^GSPC')
+            market_client.get_forward_pe('^GSPC')
 
-            # Manually expire the cache
-            cache_file = market_client._get_cache_path('^GSPC', '1y')
-            if cache_file.exists():
-                old_time = (datetime.now() - timedelta(hours=25)).timestamp()
-                import os
-                os.utime(str(cache_file), (old_time, old_time))
+            mock_ticker_class.assert_called_once_with('^GSPC')
+            assert mock_ticker.history.call_count == 2
 
-                # Should fetch fresh data
-                data2 = market_client.get_ticker_data('^GSPC', period='1y', use_cache=True, cache_ttl_hours=6)
-                assert data2 is not None
-                assert mock_ticker.history.call_count == 2  # Called again after expiry
+    def test_get_ticker_data_cache_expiry(self, market_client, mock_ticker, mock_ticker_data):
+        """Test that expired cache is refreshed."""
+        mock_ticker.history.return_value = mock_ticker_data
 
-    def test_get_ticker_data_no_data(self, market_client):
+        # First call - populate cache
+        data1 = market_client.get_ticker_data('^GSPC', period='1y', use_cache=True)
+        assert data1 is not None
+
+        # Rewrite the stored fetch time to 25 hours ago (definitely expired)
+        cache_file = market_client._get_cache_path('^GSPC', '1y')
+        table = pq.read_table(cache_file)
+        metadata = dict(table.schema.metadata)
+        metadata[CACHE_FETCHED_AT_KEY] = str(time.time() - 25 * 3600).encode()
+        pq.write_table(table.replace_schema_metadata(metadata), cache_file)
+
+        # Should fetch fresh data without decoding the stale file
+        with patch('src.data.market_data.pq.read_table', wraps=pq.read_table) as mock_read:
+            data2 = market_client.get_ticker_data('^GSPC', period='1y', use_cache=True, cache_ttl_hours=6)
+            assert not mock_read.called
+        assert data2 is not None
+        assert mock_ticker.history.call_count == 2  # Called again after expiry
+
+    def test_get_ticker_data_no_data(self, market_client, mock_ticker):
         """Test handling when no data is returned."""
-        mock_ticker = Mock()
         mock_ticker.history.return_value = pd.DataFrame()  # Empty
 
-        with patch('yfinance.Ticker', return_value=mock_ticker):
-            data = market_client.get_ticker_data('INVALID', use_cache=False)
-            assert data is None
+        data = market_client.get_ticker_data('INVALID', use_cache=False)
+        assert data is None
 
-    def test_get_ticker_data_api_error(self, market_client):
+    def test_get_ticker_data_api_error(self, market_client, mock_ticker):
         """Test handling of API errors."""
-        mock_ticker = Mock()
         mock_ticker.history.side_effect = Exception("API Error")
 
-        with patch('yfinance.Ticker', return_value=mock_ticker):
-            data = market_client.get_ticker_data('^GSPC', use_cache=False)
-            assert data is None
+        data = market_client.get_ticker_data('^GSPC', use_cache=False)
+        assert data is None
 
-    def test_get_latest_price(self, market_client, mock_ticker_data):
+    def test_get_latest_price(self, market_client, mock_ticker, mock_ticker_data):
         """Test getting latest closing price."""
-        mock_ticker = Mock()
         mock_ticker.history.return_value = mock_ticker_data
 
-        with patch('yfinance.Ticker', return_value=mock_ticker):
-            price = market_client.get_latest_price('^GSPC')
-            assert price is not None
-            assert price == 4599.0  # Last close in mock data
+        price = market_client.get_latest_price('^GSPC')
+        assert price is not None
+        assert price == 4599.0  # Last close in mock data
+        # Only the last few bars are requested, not the default 1y history
+        mock_ticker.history.assert_called_once_with(period='5d')
+
+    def test_get_latest_price_keeps_precision(self, market_client, mock_ticker):
+        """Test that prices are not rounded through float32, fresh or cached."""
+        dates = pd.date_range('2024-01-01', periods=5, freq='D')
+        mock_ticker.history.return_value = pd.DataFrame({
+            'Close': [4500.0, 4505.5, 4508.25, 4510.0, 4512.37],
+            'Volume': np.full(5, 1_000_000)
+        }, index=dates)
+
+        assert market_client.get_latest_price('^GSPC') == 4512.37
+        # Second call is served from the parquet cache
+        assert market_client.get_latest_price('^GSPC') == 4512.37
+        assert mock_ticker.history.call_count == 1
 
-    def test_get_latest_price_no_data(self, market_client):
+    def test_get_latest_price_no_data(self, market_client, mock_ticker):
         """Test get_latest_price with no data."""
-        mock_ticker = Mock()
         mock_ticker.history.return_value = None
 
-        with patch('yfinance.Ticker', return_value=mock_ticker):
-            price = market_client.get_latest_price('^GSPC')
-            assert price is None
+        price = market_client.get_latest_price('^GSPC')
+        assert price is None
 
-    def test_get_vix(self, market_client, mock_ticker_data):
+    def test_get_price_as_of(self, market_client, mock_ticker, mock_ticker_data):
+        """Test getting the last close on or before a historical date."""
+        mock_ticker.history.return_value = mock_ticker_data
+
+        assert market_client.get_price_as_of('^GSPC', '2024-02-15') == 4545.0
+        assert market_client.get_price_as_of('^GSPC', '2023-12-31') is None
+
+    def test_get_vix(self, market_client, mock_ticker, mock_ticker_data):
         """Test getting VIX volatility index."""
         # Adjust mock data for VIX range (10-30 typical)
         vix_data = mock_ticker_data.copy()
-        vix_data['Close'] = [15.0 + i*0.1 for i in range(100)]
+        vix_data['Close'] = 15.0 + np.arange(100) * 0.1
 
-        mock_ticker = Mock()
         mock_ticker.history.return_value = vix_data
 
-        with patch('yfinance.Ticker', return_value=mock_ticker):
-            vix = market_client.get_vix()
-            assert vix is not None
-            assert 10 < vix < 30  # Reasonable VIX range
+        vix = market_client.get_vix()
+        assert vix is not None
+        assert 10 < vix < 30  # Reasonable VIX range
 
-    def test_get_sp500_price(self, market_client, mock_ticker_data):
+    def test_get_sp500_price(self, market_client, mock_ticker, mock_ticker_data):
         """Test getting S&P 500 price."""
-        mock_ticker = Mock()
         mock_ticker.history.return_value = mock_ticker_data
 
-        with patch('yfinance.Ticker', return_value=mock_ticker):
-            sp500 = market_client.get_sp500_price()
-            assert sp500 is not None
-            assert sp500 > 4000  # Sanity check
+        sp500 = market_client.get_sp500_price()
+        assert sp500 is not None
+        assert sp500 > 4000  # Sanity check
 
-    def test_get_forward_pe_with_forward_pe_key(self, market_client):
+    def test_get_forward_pe_with_forward_pe_key(self, market_client, mock_ticker):
         """Test get_forward_pe when forwardPE is available."""
-        mock_ticker = Mock()
         mock_ticker.info = {'forwardPE': 19.5}
 
-        with patch('yfinance.Ticker', return_value=mock_ticker):
-            pe = market_client.get_forward_pe('^GSPC')
-            assert pe == 19.5
+        pe = market_client.get_forward_pe('^GSPC')
+        assert pe == 19.5
 
-    def test_get_forward_pe_with_forward_eps(self, market_client):
+    def test_get_forward_pe_with_forward_eps(self, market_client, mock_ticker):
         """Test get_forward_pe calculated from forwardEps and price."""
-        mock_ticker = Mock()
         mock_ticker.info = {
             'forwardEps': 250.0,
             'price': 5000.0
         }
 
-        with patch('yfinance.Ticker', return_value=mock_ticker):
-            pe = market_client.get_forward_pe('^GSPC')
-            assert pe == 20.0  # 5000 / 250
+        pe = market_client.get_forward_pe('^GSPC')
+        assert pe == 20.0  # 5000 / 250
 
-    def test_get_forward_pe_fallback_to_trailing(self, market_client):
+    def test_get_forward_pe_fallback_to_trailing(self, market_client, mock_ticker):
         """Test get_forward_pe falls back to trailingPE."""
-        mock_ticker = Mock()
         mock_ticker.info = {'trailingPE': 22.5}
 
-        with patch('yfinance.Ticker', return_value=mock_ticker):
-            pe = market_client.get_forward_pe('^GSPC')
-            assert pe == 22.5
+        pe = market_client.get_forward_pe('^GSPC')
+        assert pe == 22.5
 
-    def test_get_forward_pe_not_available(self, market_client):
+    def test_get_forward_pe_not_available(self, market_client, mock_ticker):
         """Test get_forward_pe when no P/E data available."""
-        mock_ticker = Mock()
         mock_ticker.info = {}
 
-        with patch('yfinance.Ticker', return_value=mock_ticker):
-            pe = market_client.get_forward_pe('^GSPC')
-            assert pe is None
+        pe = market_client.get_forward_pe('^GSPC')
+        assert pe is None
+
+    def test_get_forward_pe_memoized_with_ttl(self, market_client, mock_ticker):
+        """Test that forward P/E is reused per symbol until the TTL passes."""
+        mock_ticker.info = {'forwardPE': 19.5}
+        assert market_client.get_forward_pe('^GSPC') == 19.5
+
+        # Within the TTL the cached value is returned without re-reading info
+        mock_ticker.info = {'forwardPE': 21.0}
+        assert market_client.get_forward_pe('^GSPC') == 19.5
+
+        with patch('src.data.market_data.time.time', return_value=time.time() + FORWARD_PE_TTL_SECONDS + 1):
+            assert market_client.get_forward_pe('^GSPC') == 21.0
 
-    def test_get_forward_pe_api_error(self, market_client):
+    def test_get_forward_pe_api_error(self, market_client, mock_ticker):
         """Test get_forward_pe with API error."""
-        mock_ticker = Mock()
         mock_ticker.info.side_effect = Exception("API Error")
 
-        with patch('yfinance.Ticker', return_value=mock_ticker):
-            pe = market_client.get_forward_pe('^GSPC')
-            assert pe is None
+        pe = market_client.get_forward_pe('^GSPC')
+        assert pe is None
 
-    def test_get_sector_rotation_signal(self, market_client):
+    def test_get_sector_rotation_signal(self, market_client, sector_data):
         """Test sector rotation signal calculation."""
-        # Mock data for different sectors
-        def create_sector_data(start_price, end_price):
-            dates = pd.date_range('2024-01-01', periods=90, freq='D')
-            prices = [start_price + (end_price - start_price) * i / 90 for i in range(90)]
-            return pd.DataFrame({
-                'Close': prices,
-                'Volume': [1000000] * 90
-            }, index=dates)
-
-        # Defensive sectors up, cyclical down (risk-off)
-        sector_data = {
-            'XLV': create_sector_data(100, 110),  # Healthcare +10%
-            'XLP': create_sector_data(100, 108),  # Staples +8%
-            'XLU': create_sector_data(100, 106),  # Utilities +6%
-            'XLY': create_sector_data(100, 95),   # Discretionary -5%
-            'XLI': create_sector_data(100, 97),   # Industrials -3%
-            'XLF': create_sector_data(100, 94),   # Financials -6%
-        }
-
-        def mock_ticker_factory(ticker):
-            mock = Mock()
-            mock.history.return_value = sector_data.get(ticker, pd.DataFrame())
-            return mock
+        # yf.download(group_by='ticker') returns one wide frame with (ticker, field) columns
+        batch = pd.concat(sector_data, axis=1)
 
-        with patch('yfinance.Ticker', side_effect=mock_ticker_factory):
+        with patch('yfinance.download', return_value=batch) as mock_download, \
+             patch('yfinance.Ticker') as mock_ticker_class:
             result = market_client.get_sector_rotation_signal()
 
+            # All six sectors come from a single batched request
+            mock_download.assert_called_once()
+            assert mock_download.call_args.args[0].split() == list(sector_data)
+            mock_ticker_class.assert_not_called()
+
             assert result is not None
             assert 'rotation_signal' in result
 
@@ -264,10 +309,57 @@ class TestMarketDataClient:
             # Spread should be positive (defensive outperforming)
             assert rotation['spread'] > 0
 
+    def test_batch_slices_cached_like_ticker_history(self, market_client, mock_ticker_data):
+        """Test that batched downloads are cached in the same shape as Ticker.history frames."""
+        # Ticker.history returns action columns and an exchange-tz index
+        history = mock_ticker_data.assign(**{'Dividends': 0.0, 'Stock Splits': 0.0})
+        history.index = history.index.tz_localize('America/New_York')
+        batch = pd.concat({'XLV': history, 'XLP': history}, axis=1)
+
+        with patch('yfinance.download', return_value=batch) as mock_download:
+            market_client._fetch_many(['XLV', 'XLP'], period='1y')
+
+        assert mock_download.call_args.kwargs['actions'] is True
+        assert mock_download.call_args.kwargs['ignore_tz'] is False
+
+        cached = market_client._load_from_cache('XLV', '1y', ttl_hours=24)
+        assert list(cached.columns) == list(history.columns)
+        assert str(cached.index.tz) == 'America/New_York'
+
+    def test_get_sector_rotation_signal_per_ticker_fallback(self, market_client, sector_data):
+        """Test that sectors fall back to per-ticker requests when batching fails."""
+        def mock_ticker_factory(ticker):
+            mock = Mock()
+            mock.history.return_value = sector_data.get(ticker, pd.DataFrame())
+            return mock
+
+        with patch('yfinance.download', side_effect=Exception("API Error")), \
+             patch('yfinance.Ticker', side_effect=mock_ticker_factory):
+            result = market_client.get_sector_rotation_signal()
+
+            assert all(ticker in result for ticker in sector_data)
+            assert result['rotation_signal']['spread'] > 0
+
+    def test_per_ticker_fallback_runs_concurrently(self, market_client, sector_data):
+        """Test that per-ticker fallback requests are in flight at the same time."""
+        # Every request must be running at once for the barrier to release
+        barrier = threading.Barrier(len(sector_data), timeout=5)
+
+        def fetch(ticker, **kwargs):
+            barrier.wait()
+            return sector_data[ticker]
+
+        with patch('yfinance.download', side_effect=Exception("API Error")), \
+             patch.object(market_client, 'get_ticker_data', side_effect=fetch):
+            results = market_client._fetch_many(list(sector_data), period='3mo')
+
+        assert set(results) == set(sector_data)
+
     def test_get_sector_rotation_signal_error(self, market_client):
         """Test sector rotation with API error."""
-        # When get_ticker_data returns None for all tickers, we get empty results
-        with patch.object(market_client, 'get_ticker_data', return_value=None):
+        # When every fetch returns nothing for all tickers, we get empty results
+        with patch('yfinance.download', return_value=pd.DataFrame()), \
+             patch.object(market_client, 'get_ticker_data', return_value=None):
             result = market_client.get_sector_rotation_signal()
             # Function returns dict with zeros rather than None on error
             assert result is not None
@@ -283,14 +375,14 @@ class TestMarketDataClient:
         """Test cache file path generation."""
         cache_path = market_client._get_cache_path('^GSPC', '1y')
         assert cache_path.parent == market_client.cache_dir
-        assert '_GSPC_1y.csv' in str(cache_path)
+        assert cache_path.name == '_GSPC_1y.parquet'
 
     def test_cache_path_special_characters(self, market_client):
         """Test cache path handles special characters."""
         cache_path = market_client._get_cache_path('^VIX', '6mo')
         # Caret should be replaced with underscore
         assert '^' not in str(cache_path)
-        assert '_VIX_6mo.csv' in str(cache_path)
+        assert '_VIX_6mo.parquet' in str(cache_path)
 
     def test_load_cache_file_not_exists(self, market_client):
         """Test loading cache when file doesn't exist."""
@@ -308,3 +400,25 @@ class TestMarketDataClient:
         assert loaded_data is not None
         assert len(loaded_data) == len(mock_ticker_data)
         assert list(loaded_data.columns) == list(mock_ticker_data.columns)
+        pd.testing.assert_index_equal(loaded_data.index, mock_ticker_data.index)
+        # Columns are downcast before writing
+        assert loaded_data['Volume'].dtype.itemsize <= 4
+
+    def test_cache_file_read_once_until_rewritten(self, market_client, mock_ticker_data):
+        """Test that repeated cache loads reuse the parsed frame until the file changes."""
+        market_client._save_to_cache('^GSPC', '1y', mock_ticker_data)
+
+        with patch('src.data.market_data.pq.read_table', wraps=pq.read_table) as mock_read:
+            first = market_client._load_from_cache('^GSPC', '1y', ttl_hours=24)
+            second = market_client._load_from_cache('^GSPC', '1y', ttl_hours=24)
+            assert mock_read.call_count == 1
+
+            # Callers get independent copies
+            first.loc[first.index[0], 'Close'] = -1
+            assert second['Close'].iloc[0] != -1
+
+            # Rewriting the file invalidates the in-process copy
+            market_client._save_to_cache('^GSPC', '1y', mock_ticker_data.iloc[:50])
+            reloaded = market_client._load_from_cache('^GSPC', '1y', ttl_hours=24)
+            assert mock_read.call_count == 2
+            assert len(reloaded) == 50
@@ -2,113 +2,139 @@
 Unit tests for scoring modules
 """
 
+import json
+from types import MappingProxyType
+
 import pytest
-from src.scoring.recession import RecessionScorer
-from src.scoring.credit import CreditScorer
-from src.scoring.valuation import ValuationScorer
-from src.scoring.liquidity import LiquidityScorer
-from src.scoring.positioning import PositioningScorer
-from src.scoring.aggregator import RiskAggregator
+from unittest.mock import patch
+
+
+# Signal PositioningScorer emits while CFTC positioning data is unavailable
+CFTC_STUB_NOTE = "NOTE: CFTC positioning data not yet implemented"
+
+# Normal-conditions indicator values per dimension; tests override only what they exercise
+BASELINE_INDICATORS = MappingProxyType({
+    'recession': MappingProxyType({
+        'unemployment_claims_velocity_yoy': 2.0,
+        'ism_pmi': 54.0,
+        'ism_pmi_prev': 53.5,
+        'yield_curve_10y2y': 0.3,
+        'yield_curve_10y3m': 0.5,
+        'consumer_sentiment': 95.0
+    }),
+    'credit': MappingProxyType({
+        'hy_spread': 350,
+        'hy_spread_velocity_20d': 1.0,
+        'ig_spread_bbb': 120,
+        'ted_spread': 0.3,
+        'bank_lending_standards': 5.0
+    }),
+    'valuation': MappingProxyType({
+        'shiller_cape': 18.0,
+        'wilshire_5000': 28000,
+        'gdp': 28000,  # 100% ratio
+        'sp500_forward_pe': 18.0
+    }),
+    'liquidity': MappingProxyType({
+        'fed_funds_velocity_6m': 0.3,
+        'm2_velocity_yoy': 6.0,
+        'vix': 15.0
+    }),
+    'positioning': MappingProxyType({
+        'vix_proxy': 15.0
+    }),
+})
+
+
+def merge(dimension, **overrides):
+    """Return a fresh indicator dict: the dimension's baseline with overrides applied."""
+    return {**BASELINE_INDICATORS[dimension], **overrides}
+
+
+def baseline_data():
+    """Return fresh aggregator input with every dimension at its baseline."""
+    return {dimension: merge(dimension) for dimension in BASELINE_INDICATORS}
+
+
+def expected_overall_score(aggregator, result):
+    """Weighted sum of a result's dimension scores (all dimensions carry data)."""
+    return sum(aggregator.weights[dim] * score for dim, score in result['dimension_scores'].items())
+
+
+def assert_component(result, expected_score, expected_signal):
+    """Check a (score, signal) pair from a _score_* method; None score means only range-check."""
+    score, signal = result
+    if expected_score is None:
+        assert 0.0 <= score <= 10.0
+    else:
+        assert score == expected_score
+    if expected_signal is not None:
+        assert expected_signal in signal
 
 
 class TestRecessionScorer:
     """Tests for RecessionScorer."""
 
-    @pytest.fixture
-    def scorer(self):
-        return RecessionScorer()
-
-    def test_normal_conditions(self, scorer):
+    def test_normal_conditions(self, recession_scorer):
         """Test scoring under normal economic conditions."""
-        indicators = {
-            'unemployment_claims_velocity_yoy': 2.0,
-            'ism_pmi': 54.0,
-            'ism_pmi_prev': 53.5,
-            'yield_curve_10y2y': 0.3,
-            'yield_curve_10y3m': 0.5,
-            'consumer_sentiment': 95.0
-        }
-        result = scorer.calculate_score(indicators)
+        result = recession_scorer.calculate_score(merge('recession'))
 
         assert result['score'] == 0.0
         assert result['components']['unemployment_velocity'] == 0.0
         assert result['components']['pmi_regime'] == 0.0
         assert len(result['signals']) == 0
 
-    def test_recession_warning_conditions(self, scorer):
+    def test_recession_warning_conditions(self, recession_scorer):
         """Test scoring under recession warning conditions."""
-        indicators = {
-            'unemployment_claims_velocity_yoy': 12.0,  # Spiking
-            'ism_pmi': 48.5,  # Contraction
-            'ism_pmi_prev': 51.0,  # Just crossed
-            'yield_curve_10y2y': -0.6,  # Inverted
-            'yield_curve_10y3m': -0.4,
-            'consumer_sentiment': 72.0
-        }
-        result = scorer.calculate_score(indicators)
+        indicators = merge(
+            'recession',
+            unemployment_claims_velocity_yoy=12.0,  # Spiking
+            ism_pmi=48.5,  # Contraction
+            ism_pmi_prev=51.0,  # Just crossed
+            yield_curve_10y2y=-0.6,  # Inverted
+            yield_curve_10y3m=-0.4,
+            consumer_sentiment=72.0
+        )
+        result = recession_scorer.calculate_score(indicators)
 
         assert result['score'] > 7.0  # Should be high risk
         assert result['components']['unemployment_velocity'] == 2.0
         assert result['components']['pmi_regime'] == 3.0
         assert len(result['signals']) > 0
 
-    def test_unemployment_velocity_scoring(self, scorer):
+    @pytest.mark.parametrize('velocity, expected_score, expected_signal', [
+        (20.0, 3.0, 'WARNING'),  # Extreme spike (calibrated: 3.0, WARNING rather than CRITICAL)
+        (10.0, 0.5, None),       # Moderate spike (signal may be None for this threshold)
+        (5.0, None, None),       # Rising (score varies with calibrated thresholds)
+        (1.0, 0.0, None),        # Stable
+    ])
+    def test_unemployment_velocity_scoring(self, recession_scorer, velocity, expected_score, expected_signal):
         """Test unemployment velocity scoring thresholds (updated for calibrated scoring)."""
-        # Extreme spike (updated: actual score is 3.0, not 4.0)
-        score, signal = scorer._score_unemployment_velocity(20.0)
-        assert score == 3.0
-        assert 'WARNING' in signal  # Updated from CRITICAL
-
-        # Moderate spike (updated: actual score is 0.5, not 2.0)
-        score, signal = scorer._score_unemployment_velocity(10.0)
-        assert score == 0.5
-        # signal may be None for this threshold
-
-        # Rising (scores vary based on calibrated thresholds)
-        score, signal = scorer._score_unemployment_velocity(5.0)
-        assert score >= 0.0  # Just verify it's non-negative
-
-        # Stable
-        score, signal = scorer._score_unemployment_velocity(1.0)
-        assert score == 0.0
-
-    def test_pmi_regime_cross(self, scorer):
-        """Test PMI regime cross detection."""
-        # Cross into contraction
-        score, signal = scorer._score_pmi_regime(48.0, 51.0)
-        assert score == 3.0
-        assert 'CRITICAL' in signal
-
-        # Already in deep contraction
-        score, signal = scorer._score_pmi_regime(42.0, 43.0)
-        assert score == 2.5
-
-        # Healthy expansion
-        score, signal = scorer._score_pmi_regime(55.0, 54.0)
-        assert score == 0.0
-
-    def test_yield_curve_inversion(self, scorer):
-        """Test yield curve inversion scoring."""
-        # Dual deep inversion
-        score, signal = scorer._score_yield_curve(-1.0, -0.5)
-        assert score >= 2.0  # Should be at least 2.0 (capped at 2.0 total)
-        assert 'CRITICAL' in signal
-
-        # Normal (positive spreads)
-        score, signal = scorer._score_yield_curve(0.5, 0.8)
-        assert score == 0.0
-
-    def test_missing_data_handling(self, scorer):
+        assert_component(recession_scorer._score_unemployment_velocity(velocity), expected_score, expected_signal)
+
+    @pytest.mark.parametrize('method, args, expected_score, expected_signal', [
+        ('_score_pmi_regime', (48.0, 51.0), 3.0, 'CRITICAL'),   # Cross into contraction
+        ('_score_pmi_regime', (42.0, 43.0), 2.5, None),         # Already in deep contraction
+        ('_score_pmi_regime', (55.0, 54.0), 0.0, None),         # Healthy expansion
+        ('_score_yield_curve', (-1.0, -0.5), 2.0, 'CRITICAL'),  # Dual deep inversion (capped at 2.0)
+        ('_score_yield_curve', (0.5, 0.8), 0.0, None),          # Normal (positive spreads)
+    ])
+    def test_pmi_and_yield_curve_scoring(self, recession_scorer, method, args, expected_score, expected_signal):
+        """Test PMI regime cross detection and yield curve inversion scoring."""
+        assert_component(getattr(recession_scorer, method)(*args), expected_score, expected_signal)
+
+    def test_missing_data_handling(self, recession_scorer):
         """Test that missing data is handled gracefully."""
-        indicators = {
-            'unemployment_claims_velocity_yoy': None,
-            'ism_pmi': 50.0,
-            'ism_pmi_prev': None,
-            'yield_curve_10y2y': None,
-            'yield_curve_10y3m': None,
-            'consumer_sentiment': None
-        }
-        result = scorer.calculate_score(indicators)
+        indicators = merge(
+            'recession',
+            unemployment_claims_velocity_yoy=None,
+            ism_pmi=50.0,
+            ism_pmi_prev=None,
+            yield_curve_10y2y=None,
+            yield_curve_10y3m=None,
+            consumer_sentiment=None
+        )
+        result = recession_scorer.calculate_score(indicators)
 
         # Should not raise, should return partial score
         assert result['score'] >= 0
@@ -119,47 +145,37 @@ class TestRecessionScorer:
 class TestCreditScorer:
     """Tests for CreditScorer."""
 
-    @pytest.fixture
-    def scorer(self):
-        return CreditScorer()
-
-    def test_normal_conditions(self, scorer):
+    def test_normal_conditions(self, credit_scorer):
         """Test scoring under normal credit conditions."""
-        indicators = {
-            'hy_spread': 350,
-            'hy_spread_velocity_20d': 1.0,
-            'ig_spread_bbb': 120,
-            'ted_spread': 0.3,
-            'bank_lending_standards': 5.0
-        }
-        result = scorer.calculate_score(indicators)
+        result = credit_scorer.calculate_score(merge('credit'))
 
         # Updated: Credit scorer appears to baseline at higher scores
         # This may indicate conservative scoring or needs calibration review
         assert result['score'] >= 0.0  # Just verify non-negative
         assert result['score'] <= 10.0  # Within valid range
 
-    def test_crisis_conditions(self, scorer):
+    def test_crisis_conditions(self, credit_scorer):
         """Test scoring under credit crisis conditions."""
-        indicators = {
-            'hy_spread': 900,
-            'hy_spread_velocity_20d': 15.0,
-            'ig_spread_bbb': 450,
-            'ted_spread': 2.5,
-            'bank_lending_standards': 40.0
-        }
-        result = scorer.calculate_score(indicators)
+        indicators = merge(
+            'credit',
+            hy_spread=900,
+            hy_spread_velocity_20d=15.0,
+            ig_spread_bbb=450,
+            ted_spread=2.5,
+            bank_lending_standards=40.0
+        )
+        result = credit_scorer.calculate_score(indicators)
 
         assert result['score'] > 8.0  # Should be very high
         assert len(result['signals']) >= 3
 
-    def test_hy_spread_velocity_weighting(self, scorer):
+    def test_hy_spread_velocity_weighting(self, credit_scorer):
         """Test HY spread scoring behavior."""
         # High velocity, normal level
-        score1, _ = scorer._score_hy_spread(350, 12.0)
+        score1, _ = credit_scorer._score_hy_spread(350, 12.0)
 
         # Normal velocity, high level
-        score2, _ = scorer._score_hy_spread(800, 1.0)
+        score2, _ = credit_scorer._score_hy_spread(800, 1.0)
 
         # Both should contribute to score (Updated: actual behavior may baseline at 6.0)
         assert score1 >= 0.0
@@ -167,357 +183,174 @@ class TestCreditScorer:
         # Verify scores are in valid range
         assert score1 <= 10.0 and score2 <= 10.0
 
-    def test_hy_spread_scoring(self, scorer):
-        """Test HY spread scoring thresholds (updated for actual behavior)."""
-        # Rapid widening
-        score, signal = scorer._score_hy_spread(500, 12.0)
-        assert score >= 0.0  # Verify non-negative
-        assert score <= 10.0  # Within range
-        # Signal content varies based on implementation
-
-        # Stable, normal level
-        score, signal = scorer._score_hy_spread(350, 0.5)
-        assert score >= 0.0  # Updated: may not be exactly 0.0
-        assert score <= 10.0
-
-    def test_ted_spread_crisis_levels(self, scorer):
-        """Test TED spread at 2008 crisis levels."""
-        score, signal = scorer._score_ted_spread(2.5)
-        assert score == 1.0
-        assert 'CRITICAL' in signal
+    @pytest.mark.parametrize('method, args, expected_score, expected_signal', [
+        ('_score_hy_spread', (500, 12.0), None, None),  # Rapid widening
+        ('_score_hy_spread', (350, 0.5), None, None),   # Stable, normal level
+        ('_score_ted_spread', (2.5,), 1.0, 'CRITICAL'),  # 2008 crisis levels
+    ])
+    def test_spread_scoring(self, credit_scorer, method, args, expected_score, expected_signal):
+        """Test HY and TED spread scoring thresholds (updated for actual behavior)."""
+        assert_component(getattr(credit_scorer, method)(*args), expected_score, expected_signal)
 
 
 class TestValuationScorer:
     """Tests for ValuationScorer."""
 
-    @pytest.fixture
-    def scorer(self):
-        return ValuationScorer()
-
-    def test_normal_valuations(self, scorer):
+    def test_normal_valuations(self, valuation_scorer):
         """Test scoring with normal valuations."""
-        indicators = {
-            'shiller_cape': 18.0,
-            'wilshire_5000': 28000,
-            'gdp': 28000,  # 100% ratio
-            'sp500_forward_pe': 18.0
-        }
-        result = scorer.calculate_score(indicators)
+        result = valuation_scorer.calculate_score(merge('valuation'))
 
         assert result['score'] <= 1.0
 
-    def test_bubble_valuations(self, scorer):
+    def test_bubble_valuations(self, valuation_scorer):
         """Test scoring with bubble-level valuations (updated for calibrated scoring)."""
-        indicators = {
-            'shiller_cape': 38.0,  # Dot-com levels
-            'wilshire_5000': 60000,
-            'gdp': 28000,  # >200% ratio
-            'sp500_forward_pe': 28.0
-        }
-        result = scorer.calculate_score(indicators)
+        indicators = merge(
+            'valuation',
+            shiller_cape=38.0,  # Dot-com levels
+            wilshire_5000=60000,  # >200% of GDP
+            sp500_forward_pe=28.0
+        )
+        result = valuation_scorer.calculate_score(indicators)
 
         # Updated: Actual score is around 5.5, not >8.0 (more realistic calibration)
         assert result['score'] >= 5.0
         assert len(result['signals']) >= 1  # At least one signal
 
-    def test_missing_cape(self, scorer):
-        """Test handling when CAPE is missing."""
-        indicators = {
-            'shiller_cape': None,
-            'wilshire_5000': 28000,
-            'gdp': 28000,
-            'sp500_forward_pe': 18.0
-        }
-        result = scorer.calculate_score(indicators)
-
-        assert result['components']['cape'] is None
-        # Should still score with other indicators
-        assert result['score'] >= 0
-
-    def test_missing_buffett_indicator(self, scorer):
-        """Test handling when Buffett indicator data is missing."""
-        indicators = {
-            'shiller_cape': 25.0,
-            'wilshire_5000': None,
-            'gdp': None,
-            'sp500_forward_pe': 18.0
-        }
-        result = scorer.calculate_score(indicators)
-
-        assert result['components']['buffett_indicator'] is None
-        # Should still score with other indicators
-        assert result['score'] >= 0
-
-    def test_missing_forward_pe(self, scorer):
-        """Test handling when forward P/E is missing."""
-        indicators = {
-            'shiller_cape': 25.0,
-            'wilshire_5000': 28000,
-            'gdp': 28000,
-            'sp500_forward_pe': None
-        }
-        result = scorer.calculate_score(indicators)
+    @pytest.mark.parametrize('overrides, component', [
+        ({'shiller_cape': None}, 'cape'),
+        ({'shiller_cape': 25.0, 'wilshire_5000': None, 'gdp': None}, 'buffett_indicator'),
+        ({'shiller_cape': 25.0, 'sp500_forward_pe': None}, 'forward_pe'),
+    ], ids=['cape', 'buffett_indicator', 'forward_pe'])
+    def test_missing_indicator(self, valuation_scorer, overrides, component):
+        """Test that a missing indicator leaves its component None and still scores the rest."""
+        result = valuation_scorer.calculate_score(merge('valuation', **overrides))
 
-        assert result['components']['forward_pe'] is None
-        # Should still score with other indicators
+        assert result['components'][component] is None
         assert result['score'] >= 0
 
-    def test_cape_scoring(self, scorer):
-        """Test CAPE ratio scoring (updated for calibrated thresholds)."""
-        # Bubble levels (actual score is 3.5, not 4.0)
-        score, signal = scorer._score_cape(38.0)
-        assert score == 3.5
-        assert 'WARNING' in signal or 'CRITICAL' in signal
-
-        # Normal levels
-        score, signal = scorer._score_cape(17.0)
-        assert score == 0.0
-
-    def test_buffett_indicator(self, scorer):
-        """Test Buffett Indicator - updated for actual behavior."""
-        # Extreme overvaluation (>200% = 2.14 ratio)
-        ratio_extreme = 60000 / 28000  # = 2.14
-        score, signal = scorer._score_buffett_ratio(ratio_extreme)
-        # Updated: Actual behavior returns 0.0 for all ratios (may need calibration)
-        assert score >= 0.0
-        assert score <= 10.0
-
-        # Fair value (~100% = 1.0 ratio)
-        ratio_fair = 28000 / 28000  # = 1.0
-        score, signal = scorer._score_buffett_ratio(ratio_fair)
-        assert score >= 0.0  # Just verify non-negative
+    @pytest.mark.parametrize('method, value, expected_score, expected_signal', [
+        ('_score_cape', 38.0, 3.5, 'WARNING'),             # Bubble levels (calibrated: 3.5)
+        ('_score_cape', 17.0, 0.0, None),                  # Normal levels
+        ('_score_buffett_ratio', 60000 / 28000, None, None),  # Extreme overvaluation (>200%)
+        ('_score_buffett_ratio', 28000 / 28000, None, None),  # Fair value (~100%)
+    ])
+    def test_valuation_component_scoring(self, valuation_scorer, method, value, expected_score, expected_signal):
+        """Test CAPE and Buffett Indicator scoring (updated for calibrated thresholds)."""
+        assert_component(getattr(valuation_scorer, method)(value), expected_score, expected_signal)
 
 
 class TestLiquidityScorer:
     """Tests for LiquidityScorer."""
 
-    @pytest.fixture
-    def scorer(self):
-        return LiquidityScorer()
-
-    def test_normal_liquidity(self, scorer):
+    def test_normal_liquidity(self, liquidity_scorer):
         """Test scoring under normal liquidity conditions."""
-        indicators = {
-            'fed_funds_velocity_6m': 0.3,
-            'm2_velocity_yoy': 6.0,
-            'vix': 15.0
-        }
-        result = scorer.calculate_score(indicators)
+        result = liquidity_scorer.calculate_score(merge('liquidity'))
 
         assert result['score'] <= 1.0
 
-    def test_tight_liquidity(self, scorer):
+    def test_tight_liquidity(self, liquidity_scorer):
         """Test scoring under tight liquidity conditions (updated for calibrated scoring)."""
-        indicators = {
-            'fed_funds_velocity_6m': 2.5,  # Rapid tightening
-            'm2_velocity_yoy': -1.0,  # Contracting
-            'vix': 35.0  # Fear
-        }
-        result = scorer.calculate_score(indicators)
+        indicators = merge(
+            'liquidity',
+            fed_funds_velocity_6m=2.5,  # Rapid tightening
+            m2_velocity_yoy=-1.0,  # Contracting
+            vix=35.0  # Fear
+        )
+        result = liquidity_scorer.calculate_score(indicators)
 
         # Updated: Actual score is 5.0, not >7.0 (more realistic calibration)
         assert result['score'] >= 5.0
 
-    def test_missing_fed_velocity(self, scorer):
-        """Test handling when Fed funds velocity is missing."""
-        indicators = {
-            'fed_funds_velocity_6m': None,
-            'm2_velocity_yoy': 5.0,
-            'vix': 15.0
-        }
-        result = scorer.calculate_score(indicators)
-
-        assert result['components']['fed_trajectory'] is None
-        # Should still score with other indicators
-        assert result['score'] >= 0
-
-    def test_missing_m2_velocity(self, scorer):
-        """Test handling when M2 velocity is missing."""
-        indicators = {
-            'fed_funds_velocity_6m': 0.3,
-            'm2_velocity_yoy': None,
-            'vix': 15.0
-        }
-        result = scorer.calculate_score(indicators)
-
-        assert result['components']['m2_growth'] is None
-        # Should still score with other indicators
-        assert result['score'] >= 0
-
-    def test_missing_vix(self, scorer):
-        """Test handling when VIX is missing."""
-        indicators = {
-            'fed_funds_velocity_6m': 0.3,
-            'm2_velocity_yoy': 5.0,
-            'vix': None
-        }
-        result = scorer.calculate_score(indicators)
+    @pytest.mark.parametrize('overrides, component', [
+        ({'fed_funds_velocity_6m': None, 'm2_velocity_yoy': 5.0}, 'fed_trajectory'),
+        ({'m2_velocity_yoy': None}, 'm2_growth'),
+        ({'m2_velocity_yoy': 5.0, 'vix': None}, 'vix'),
+    ], ids=['fed_trajectory', 'm2_growth', 'vix'])
+    def test_missing_indicator(self, liquidity_scorer, overrides, component):
+        """Test that a missing indicator leaves its component None and still scores the rest."""
+        result = liquidity_scorer.calculate_score(merge('liquidity', **overrides))
 
-        assert result['components']['vix'] is None
-        # Should still score with other indicators
+        assert result['components'][component] is None
         assert result['score'] >= 0
 
-    def test_fed_tightening(self, scorer):
-        """Test Fed tightening trajectory scoring (updated for actual behavior)."""
-        # Rapid tightening (actual score is 0.0, thresholds may be different)
-        score, signal = scorer._score_fed_trajectory(2.5)
-        assert score >= 0.0  # Verify non-negative
-        # Threshold may be different than expected
-
-        # Stable
-        score, signal = scorer._score_fed_trajectory(0.2)
-        assert score == 0.0
-
-    def test_m2_contraction(self, scorer):
-        """Test M2 contraction scoring."""
-        # Contraction (rare and concerning)
-        score, signal = scorer._score_m2_growth(-2.0)
-        assert score == 3.0
-        assert 'CRITICAL' in signal
-
-        # Normal growth
-        score, signal = scorer._score_m2_growth(6.0)
-        assert score == 0.0
-
-    def test_vix_panic_levels(self, scorer):
-        """Test VIX at panic levels."""
-        # Panic
-        score, signal = scorer._score_vix(45.0)
-        assert score == 3.0
-        assert 'CRITICAL' in signal
-
-        # Normal
-        score, signal = scorer._score_vix(15.0)
-        assert score == 0.0
+    @pytest.mark.parametrize('method, value, expected_score, expected_signal', [
+        ('_score_fed_trajectory', 2.5, None, None),     # Rapid tightening (thresholds calibrated)
+        ('_score_fed_trajectory', 0.2, 0.0, None),      # Stable
+        ('_score_m2_growth', -2.0, 3.0, 'CRITICAL'),    # Contraction (rare and concerning)
+        ('_score_m2_growth', 6.0, 0.0, None),           # Normal growth
+        ('_score_vix', 45.0, 3.0, 'CRITICAL'),          # Panic
+        ('_score_vix', 15.0, 0.0, None),                # Normal
+    ])
+    def test_liquidity_component_scoring(self, liquidity_scorer, method, value, expected_score, expected_signal):
+        """Test Fed trajectory, M2 and VIX scoring thresholds."""
+        assert_component(getattr(liquidity_scorer, method)(value), expected_score, expected_signal)
 
 
 class TestPositioningScorer:
     """Tests for PositioningScorer."""
 
-    @pytest.fixture
-    def scorer(self):
-        return PositioningScorer()
-
-    def test_normal_positioning(self, scorer):
-        """Test scoring with normal VIX levels."""
-        indicators = {
-            'vix_proxy': 16.0
-        }
-        result = scorer.calculate_score(indicators)
-
-        assert result['score'] == 0.0
-
-    def test_extreme_complacency(self, scorer):
-        """Test scoring with extreme complacency (very low VIX)."""
-        indicators = {
-            'vix_proxy': 10.0
-        }
-        result = scorer.calculate_score(indicators)
-
-        assert result['score'] == 10.0  # Maximum score
-        assert 'CRITICAL' in result['signals'][0]
-
-    def test_cftc_stub(self, scorer):
+    @pytest.mark.parametrize('vix, expected_score, expected_tags', [
+        (16.0, 0.0, []),              # Normal
+        (10.0, 10.0, ['CRITICAL']),   # Extreme complacency (maximum score)
+        (12.0, 5.0, ['WARNING']),     # Very low VIX
+        (14.0, 2.0, ['WATCH']),       # Low VIX, some complacency
+        (45.0, 3.0, ['NOTE']),        # Panic
+    ])
+    def test_vix_positioning_scoring(self, positioning_scorer, vix, expected_score, expected_tags):
+        """Test positioning score across VIX levels."""
+        # CFTC values present, so the only signal is the VIX one
+        result = positioning_scorer.calculate_score({'vix_proxy': vix, 'sp500_net_speculative': 0.0})
+
+        assert result['score'] == expected_score
+        assert result['signal_tags'] == expected_tags
+
+    def test_cftc_stub(self, positioning_scorer):
         """Test that CFTC data absence is noted."""
         indicators = {
             'sp500_net_speculative': None,
             'treasury_net_speculative': None,
             'vix_proxy': 15.0
         }
-        result = scorer.calculate_score(indicators)
+        result = positioning_scorer.calculate_score(indicators)
 
         # Should have note about CFTC not implemented
-        assert any('CFTC' in signal for signal in result['signals'])
+        assert CFTC_STUB_NOTE in result['signals']
 
-    def test_missing_vix_data(self, scorer):
+    def test_missing_vix_data(self, positioning_scorer):
         """Test handling when VIX data is missing."""
         indicators = {
             'vix_proxy': None
         }
-        result = scorer.calculate_score(indicators)
+        result = positioning_scorer.calculate_score(indicators)
 
         assert result['score'] == 0.0
         assert result['components']['vix_positioning'] is None
         # Check for CFTC note (since VIX is missing, CFTC data is also None)
-        assert any('CFTC' in signal for signal in result['signals'])
-
-    def test_very_low_vix(self, scorer):
-        """Test scoring with very low VIX (complacency)."""
-        indicators = {
-            'vix_proxy': 12.0
-        }
-        result = scorer.calculate_score(indicators)
-
-        assert result['score'] == 5.0
-        assert any('WARNING' in signal for signal in result['signals'])
-
-    def test_low_vix(self, scorer):
-        """Test scoring with low VIX (some complacency)."""
-        indicators = {
-            'vix_proxy': 14.0
-        }
-        result = scorer.calculate_score(indicators)
-
-        assert result['score'] == 2.0
-        assert any('WATCH' in signal for signal in result['signals'])
+        assert result['signals'] == [CFTC_STUB_NOTE]
+        assert result['signal_tags'] == ['NOTE']
 
-    def test_extreme_fear_vix(self, scorer):
-        """Test scoring with extreme high VIX (panic)."""
-        indicators = {
-            'vix_proxy': 45.0
-        }
-        result = scorer.calculate_score(indicators)
+    def test_signal_tags(self, positioning_scorer):
+        """Test that signal_tags lists each signal's severity tag once, sorted."""
+        result = positioning_scorer.calculate_score({'vix_proxy': 10.0})
 
-        assert result['score'] == 3.0
-        assert any('extreme' in signal.lower() for signal in result['signals'])
+        assert result['signal_tags'] == ['CRITICAL', 'NOTE']
 
 
 class TestRiskAggregator:
     """Tests for RiskAggregator."""
 
-    @pytest.fixture
-    def aggregator(self):
-        return RiskAggregator()
+    def test_uses_injected_scorers(self, aggregator, shared_scorers):
+        """Test that pre-built scorers are reused instead of constructing new ones."""
+        assert aggregator.recession_scorer is shared_scorers['recession']
+        assert aggregator.positioning_scorer is shared_scorers['positioning']
 
     def test_weight_validation(self, aggregator):
         """Test that weights sum to 1.0."""
-        weights = aggregator.weights
-        total = sum(weights.values())
-        assert 0.99 <= total <= 1.01
+        assert sum(aggregator.weights.values()) == pytest.approx(1.0, abs=0.01)
 
     def test_overall_risk_calculation(self, aggregator):
         """Test overall risk score calculation."""
-        test_data = {
-            'recession': {
-                'unemployment_claims_velocity_yoy': 2.0,
-                'ism_pmi': 54.0,
-                'ism_pmi_prev': 53.5,
-                'yield_curve_10y2y': 0.3,
-                'yield_curve_10y3m': 0.5,
-                'consumer_sentiment': 95.0
-            },
-            'credit': {
-                'hy_spread': 350,
-                'hy_spread_velocity_20d': 1.0,
-                'ig_spread_bbb': 120,
-                'ted_spread': 0.3,
-                'bank_lending_standards': 5.0
-            },
-            'valuation': {
-                'shiller_cape': 18.0,
-                'wilshire_5000': 28000,
-                'gdp': 28000,
-                'sp500_forward_pe': 18.0
-            },
-            'liquidity': {
-                'fed_funds_velocity_6m': 0.3,
-                'm2_velocity_yoy': 6.0,
-                'vix': 15.0
-            },
-            'positioning': {
-                'vix_proxy': 15.0
-            }
-        }
+        test_data = baseline_data()
 
         result = aggregator.calculate_overall_risk(test_data)
 
@@ -526,99 +359,115 @@ class TestRiskAggregator:
         assert result['tier'] in ['GREEN', 'YELLOW', 'RED']
         assert 'dimension_scores' in result
         assert len(result['dimension_scores']) == 5
-
-    def test_risk_tier_classification(self, aggregator):
+        assert result['overall_score'] == pytest.approx(
+            expected_overall_score(aggregator, result), abs=0.01
+        )
+        # Results, dimension details included, must stay JSON-serializable
+        json.dumps(result)
+
+    @pytest.mark.parametrize('score, expected_tier', [
+        (3.5, 'GREEN'),   # Below 4.0
+        (4.5, 'YELLOW'),  # 4.0-4.99
+        (5.2, 'RED'),     # >=5.0
+    ])
+    def test_risk_tier_classification(self, aggregator, score, expected_tier):
         """Test risk tier classification (updated for calibrated thresholds: YELLOW=4.0, RED=5.0)."""
-        # GREEN (below 4.0)
-        assert aggregator._get_risk_tier(3.5) == 'GREEN'
-
-        # YELLOW (4.0-4.99)
-        assert aggregator._get_risk_tier(4.5) == 'YELLOW'
-
-        # RED (>=5.0)
-        assert aggregator._get_risk_tier(5.2) == 'RED'
+        assert aggregator._get_risk_tier(score) == expected_tier
+        # A single dimension carries the full (re-normalized) weight
+        result = aggregator.calculate_overall_risk_from_scores({'recession': score})
+        assert result['overall_score'] == pytest.approx(score, abs=1e-6)
+        assert result['tier'] == expected_tier
 
     def test_weighted_calculation(self, aggregator):
         """Test that weighted calculation is correct."""
-        # Create data where we know exact scores
-        test_data = {
-            'recession': {
-                'unemployment_claims_velocity_yoy': 20.0,  # Should give 4.0
-                'ism_pmi': 55.0,  # Should give 0.0
-                'ism_pmi_prev': 54.0,
-                'yield_curve_10y2y': 0.5,  # Should give 0.0
-                'yield_curve_10y3m': 0.5,
-                'consumer_sentiment': 100.0  # Should give 0.0
-            },
-            'credit': {
-                'hy_spread': 350,
-                'hy_spread_velocity_20d': 0.5,
-                'ig_spread_bbb': 120,
-                'ted_spread': 0.3,
-                'bank_lending_standards': 5.0
-            },
-            'valuation': {
-                'shiller_cape': 17.0,
-                'wilshire_5000': 28000,
-                'gdp': 28000,
-                'sp500_forward_pe': 18.0
-            },
-            'liquidity': {
-                'fed_funds_velocity_6m': 0.2,
-                'm2_velocity_yoy': 6.0,
-                'vix': 15.0
-            },
-            'positioning': {
-                'vix_proxy': 15.0
-            }
-        }
+        scores = {'recession': 3.0, 'credit': 8.0, 'valuation': 0.0, 'liquidity': 0.0, 'positioning': 2.0}
+        weights = aggregator.weights
+
+        result = aggregator.calculate_overall_risk_from_scores(scores)
+
+        expected = sum(weights[dim] * score for dim, score in scores.items())
+        assert result['overall_score'] == pytest.approx(expected, abs=0.01)
+
+        # Leaving a dimension out re-normalizes the remaining weights
+        del scores['credit']
+        result = aggregator.calculate_overall_risk_from_scores(scores)
+
+        assert sum(result['normalized_weights'].values()) == pytest.approx(1.0)
+        expected = (sum(weights[dim] * score for dim, score in scores.items())
+                    / sum(weights[dim] for dim in scores))
+        assert result['overall_score'] == pytest.approx(expected, abs=0.01)
+
+    def test_unknown_dimension_rejected(self, aggregator):
+        """Test that a score for a dimension with no weight raises a ValueError naming it."""
+        with pytest.raises(ValueError, match="'sentiment'"):
+            aggregator.calculate_overall_risk_from_scores({'recession': 3.0, 'sentiment': 5.0})
+
+    def test_weighted_calculation_end_to_end(self, aggregator):
+        """Test the full pipeline's recession score and weighted overall score."""
+        test_data = baseline_data()
+        test_data['recession'] = merge(
+            'recession',
+            unemployment_claims_velocity_yoy=20.0,  # Should give 4.0
+            ism_pmi=55.0,  # Should give 0.0
+            ism_pmi_prev=54.0,
+            yield_curve_10y2y=0.5,  # Should give 0.0
+            consumer_sentiment=100.0  # Should give 0.0
+        )
+        test_data['credit'] = merge('credit', hy_spread_velocity_20d=0.5)
+        test_data['valuation'] = merge('valuation', shiller_cape=17.0)
+        test_data['liquidity'] = merge('liquidity', fed_funds_velocity_6m=0.2)
 
         result = aggregator.calculate_overall_risk(test_data)
 
         # Recession score is actually 3.0 (updated scoring), weighted by 0.30 = 0.9
         # Credit baseline is ~8.0 (needs calibration review), weighted by 0.25 = 2.0
-        # Overall will be higher than expected due to credit baseline
-        # Just verify it's in a reasonable range
-        assert result['dimension_scores']['recession'] == 3.0  # Updated from 4.0
-        assert result['overall_score'] >= 0.0
-        assert result['overall_score'] <= 10.0
+        # so check the overall score against the weighted sum rather than a fixed value
+        assert result['dimension_scores']['recession'] == pytest.approx(3.0, abs=1e-6)  # Updated from 4.0
+        assert result['overall_score'] == pytest.approx(
+            expected_overall_score(aggregator, result), abs=0.01
+        )
 
     def test_signal_aggregation(self, aggregator):
         """Test that signals from all dimensions are collected."""
-        test_data = {
-            'recession': {
-                'unemployment_claims_velocity_yoy': 15.0,  # Will generate signal
-                'ism_pmi': 54.0,
-                'ism_pmi_prev': 53.5,
-                'yield_curve_10y2y': 0.3,
-                'yield_curve_10y3m': 0.5,
-                'consumer_sentiment': 95.0
-            },
-            'credit': {
-                'hy_spread': 850,  # Will generate signal
-                'hy_spread_velocity_20d': 1.0,
-                'ig_spread_bbb': 120,
-                'ted_spread': 0.3,
-                'bank_lending_standards': 5.0
-            },
-            'valuation': {
-                'shiller_cape': 18.0,
-                'wilshire_5000': 28000,
-                'gdp': 28000,
-                'sp500_forward_pe': 18.0
-            },
-            'liquidity': {
-                'fed_funds_velocity_6m': 0.3,
-                'm2_velocity_yoy': 6.0,
-                'vix': 15.0
-            },
-            'positioning': {
-                'vix_proxy': 15.0
-            }
-        }
+        test_data = baseline_data()
+        test_data['recession'] = merge('recession', unemployment_claims_velocity_yoy=15.0)  # Will generate signal
+        test_data['credit'] = merge('credit', hy_spread=850)  # Will generate signal
 
         result = aggregator.calculate_overall_risk(test_data)
 
         # Should have signals from recession and credit at least
         assert len(result['all_signals']['recession']) > 0
         assert len(result['all_signals']['credit']) > 0
+        assert result['metadata']['total_signals'] == sum(
+            len(signals) for signals in result['all_signals'].values()
+        )
+
+    def test_result_cache_reuses_identical_inputs(self, aggregator):
+        """Test that identical inputs are scored once and callers get independent copies."""
+        test_data = {
+            'recession': {'yield_curve_10y2y': -0.5, 'unemployment_claims_velocity_yoy': 15.0},
+            'credit': {'hy_spread': 850},
+            'valuation': {'shiller_cape': 30.0},
+            'liquidity': {'vix': 25.0},
+            'positioning': {'vix_proxy': 25.0},
+            'metadata': {'fetch_timestamp': '2024-01-01T00:00:00'}
+        }
+
+        first = aggregator.calculate_overall_risk(test_data)
+        first['overall_score'] = -1
+
+        # Fetch metadata doesn't affect the score, so it doesn't bust the cache
+        repeat_data = dict(test_data, metadata={'fetch_timestamp': '2024-01-02T00:00:00'})
+        with patch.object(aggregator.recession_scorer, 'calculate_score') as mock_score:
+            second = aggregator.calculate_overall_risk(repeat_data)
+            assert not mock_score.called
+
+        assert second['overall_score'] != -1
+        assert second == aggregator.calculate_overall_risk(test_data)
+
+        # Different data is scored afresh
+        changed = dict(test_data, credit={'hy_spread': 300})
+        with patch.object(aggregator.credit_scorer, 'calculate_score',
+                          wraps=aggregator.credit_scorer.calculate_score) as mock_score:
+            aggregator.calculate_overall_risk(changed)
+            assert mock_score.call_count == 1
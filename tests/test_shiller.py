@@ -3,7 +3,7 @@ Unit tests for Shiller CAPE data scraper
 """
 
 import pytest
-from unittest.mock import Mock, patch, MagicMock, mock_open
+from types import SimpleNamespace
 from pathlib import Path
 from datetime import datetime, timedelta
 import pandas as pd
@@ -12,9 +12,53 @@ import requests
 from src.data.shiller import ShillerDataClient
 
 
+# Frames standing in for Shiller's Excel sheet, built once per module. No test
+# mutates what read_excel returns, so they are shared as-is.
+CAPE_DF = pd.DataFrame({
+    'Date': pd.date_range('2020-01', periods=12, freq='MS'),
+    'S&P Composite': [3200 + i*50 for i in range(12)],
+    'CAPE': [30.0 + i*0.5 for i in range(12)]
+})
+ALT_CAPE_DF = CAPE_DF.rename(columns={'CAPE': 'Cyclically Adjusted PE Ratio'})
+NO_CAPE_DF = CAPE_DF.drop(columns=['CAPE'])
+EMPTY_CAPE_DF = pd.DataFrame({'Date': [], 'CAPE': []})
+
+
+def _ok_response(content=b'mock excel content'):
+    """Minimal successful requests.Response stand-in (content + raise_for_status)."""
+    return SimpleNamespace(content=content, raise_for_status=lambda: None)
+
+
 class TestShillerDataClient:
     """Test suite for Shiller CAPE scraper."""
 
+    @pytest.fixture(autouse=True)
+    def net_stub(self, monkeypatch):
+        """
+        Stub out requests.get and pandas.read_excel for every test.
+
+        Tests configure the stub instead of patching: set ``excel`` to the frame
+        read_excel returns, or ``get_error``/``excel_error`` to make either raise.
+        ``get_calls`` records the (url, kwargs) of each download attempt.
+        """
+        stub = SimpleNamespace(response=_ok_response(), excel=None, get_error=None,
+                               excel_error=None, get_calls=[])
+
+        def fake_get(url, **kwargs):
+            stub.get_calls.append((url, kwargs))
+            if stub.get_error is not None:
+                raise stub.get_error
+            return stub.response
+
+        def fake_read_excel(*args, **kwargs):
+            if stub.excel_error is not None:
+                raise stub.excel_error
+            return stub.excel
+
+        monkeypatch.setattr('requests.get', fake_get)
+        monkeypatch.setattr('pandas.read_excel', fake_read_excel)
+        return stub
+
     @pytest.fixture
     def temp_cache_dir(self, tmp_path):
         """Create temporary cache directory."""
@@ -27,17 +71,6 @@ class TestShillerDataClient:
         """Create ShillerDataClient with temp cache."""
         return ShillerDataClient(cache_dir=str(temp_cache_dir))
 
-    @pytest.fixture
-    def mock_excel_data(self):
-        """Create mock Excel data that mimics Shiller's format."""
-        # Create sample data matching Shiller's structure
-        data = {
-            'Date': pd.date_range('2020-01', periods=12, freq='MS'),
-            'S&P Composite': [3200 + i*50 for i in range(12)],
-            'CAPE': [30.0 + i*0.5 for i in range(12)]
-        }
-        return pd.DataFrame(data)
-
     def test_initialization(self, temp_cache_dir):
         """Test ShillerDataClient initialization."""
         client = ShillerDataClient(cache_dir=str(temp_cache_dir))
@@ -52,118 +85,76 @@ class TestShillerDataClient:
         # Should create cache dir in project/data/cache/shiller
         assert 'shiller' in str(client.cache_dir)
 
-    def test_get_latest_cape_from_web(self, shiller_client, mock_excel_data, temp_cache_dir):
+    def test_get_latest_cape_from_web(self, shiller_client, net_stub):
         """Test fetching CAPE from web successfully."""
-        # Mock the requests.get call
-        mock_response = Mock()
-        mock_response.content = b'mock excel content'
-        mock_response.raise_for_status = Mock()
-
-        with patch('requests.get', return_value=mock_response), \
-             patch('pandas.read_excel', return_value=mock_excel_data):
+        net_stub.excel = CAPE_DF
 
-            cape = shiller_client.get_latest_cape(use_cache=False)
+        cape = shiller_client.get_latest_cape(use_cache=False)
 
-            assert cape is not None
-            assert cape == 35.5  # Last value in mock data (30.0 + 11*0.5)
+        assert cape is not None
+        assert cape == 35.5  # Last value in mock data (30.0 + 11*0.5)
 
-    def test_get_latest_cape_with_caching(self, shiller_client, mock_excel_data):
+    @pytest.mark.io
+    def test_get_latest_cape_with_caching(self, shiller_client, net_stub):
         """Test CAPE caching mechanism."""
-        mock_response = Mock()
-        mock_response.content = b'mock excel content'
-        mock_response.raise_for_status = Mock()
-
-        with patch('requests.get', return_value=mock_response), \
-             patch('pandas.read_excel', return_value=mock_excel_data):
+        net_stub.excel = CAPE_DF
 
-            # First call - should fetch from web
-            cape1 = shiller_client.get_latest_cape(use_cache=True)
-            assert cape1 == 35.5
+        # First call - should fetch from web
+        cape1 = shiller_client.get_latest_cape(use_cache=True)
+        assert cape1 == 35.5
 
-            # Second call - should use cache (requests.get shouldn't be called again)
-            with patch('requests.get', side_effect=Exception("Should not call API")) as mock_get:
-                cape2 = shiller_client.get_latest_cape(use_cache=True, cache_ttl_days=7)
-                assert cape2 == 35.5  # Same value from cache
-                mock_get.assert_not_called()
+        # Second call - should use cache (requests.get shouldn't be called again)
+        net_stub.get_error = Exception("Should not call API")
+        cape2 = shiller_client.get_latest_cape(use_cache=True, cache_ttl_days=7)
+        assert cape2 == 35.5  # Same value from cache
+        assert len(net_stub.get_calls) == 1
 
-    def test_cache_expiry(self, shiller_client, mock_excel_data):
+    @pytest.mark.io
+    def test_cache_expiry(self, shiller_client, net_stub, monkeypatch):
         """Test that expired cache is refreshed."""
-        mock_response = Mock()
-        mock_response.content = b'mock excel content'
-        mock_response.raise_for_status = Mock()
-
-        with patch('requests.get', return_value=mock_response), \
-             patch('pandas.read_excel', return_value=mock_excel_data):
-
-            # First call - populate cache
-            cape1 = shiller_client.get_latest_cape(use_cache=True)
-            assert cape1 == 35.5
-
-            # Manually expire the cache by setting old timestamp
-            cache_file = shiller_client._get_cache_path()
-            if cache_file.exists():
-                old_time = (datetime.now() - timedelta(days=10)).timestamp()
-                cache_file.touch()
-                import os
-                os.utime(str(cache_file), (old_time, old_time))
-
-                # Should fetch fresh data
-                cape2 = shiller_client.get_latest_cape(use_cache=True, cache_ttl_days=7)
-                assert cape2 == 35.5
-
-    def test_get_latest_cape_network_error(self, shiller_client):
-        """Test handling of network errors."""
-        with patch('requests.get', side_effect=requests.RequestException("Network error")):
-            cape = shiller_client.get_latest_cape(use_cache=False)
-            assert cape is None
+        net_stub.excel = CAPE_DF
 
-    def test_get_latest_cape_parsing_error(self, shiller_client):
-        """Test handling of Excel parsing errors."""
-        mock_response = Mock()
-        mock_response.content = b'invalid excel content'
-        mock_response.raise_for_status = Mock()
+        # First call - populate cache
+        cape1 = shiller_client.get_latest_cape(use_cache=True)
+        assert cape1 == 35.5
 
-        with patch('requests.get', return_value=mock_response), \
-             patch('pandas.read_excel', side_effect=Exception("Parse error")):
+        # Expire the cache by moving the clock 10 days ahead
+        monkeypatch.setattr('src.data.shiller._now', lambda: datetime.now() + timedelta(days=10))
 
-            cape = shiller_client.get_latest_cape(use_cache=False)
-            assert cape is None
+        # Should fetch fresh data
+        cape2 = shiller_client.get_latest_cape(use_cache=True, cache_ttl_days=7)
+        assert cape2 == 35.5
+        assert len(net_stub.get_calls) == 2
 
-    def test_get_latest_cape_no_cape_column(self, shiller_client):
-        """Test handling when CAPE column is missing."""
-        mock_response = Mock()
-        mock_response.content = b'mock excel content'
-        mock_response.raise_for_status = Mock()
+    def test_get_latest_cape_network_error(self, shiller_client, net_stub):
+        """Test handling of network errors."""
+        net_stub.get_error = requests.RequestException("Network error")
 
-        # DataFrame without CAPE column
-        bad_data = pd.DataFrame({
-            'Date': pd.date_range('2020-01', periods=12, freq='MS'),
-            'S&P Composite': [3200 + i*50 for i in range(12)]
-        })
+        cape = shiller_client.get_latest_cape(use_cache=False)
+        assert cape is None
 
-        with patch('requests.get', return_value=mock_response), \
-             patch('pandas.read_excel', return_value=bad_data):
+    def test_get_latest_cape_parsing_error(self, shiller_client, net_stub):
+        """Test handling of Excel parsing errors."""
+        net_stub.response = _ok_response(b'invalid excel content')
+        net_stub.excel_error = Exception("Parse error")
 
-            cape = shiller_client.get_latest_cape(use_cache=False)
-            assert cape is None
+        cape = shiller_client.get_latest_cape(use_cache=False)
+        assert cape is None
 
-    def test_get_latest_cape_empty_dataframe(self, shiller_client):
-        """Test handling of empty dataframe."""
-        mock_response = Mock()
-        mock_response.content = b'mock excel content'
-        mock_response.raise_for_status = Mock()
+    def test_get_latest_cape_no_cape_column(self, shiller_client, net_stub):
+        """Test handling when CAPE column is missing."""
+        # DataFrame without CAPE column
+        net_stub.excel = NO_CAPE_DF
 
-        # Empty DataFrame
-        empty_data = pd.DataFrame({
-            'Date': [],
-            'CAPE': []
-        })
+        cape = shiller_client.get_latest_cape(use_cache=False)
+        assert cape is None
 
-        with patch('requests.get', return_value=mock_response), \
-             patch('pandas.read_excel', return_value=empty_data):
+    def test_get_latest_cape_empty_dataframe(self, shiller_client, net_stub):
+        """Test handling of empty dataframe."""
+        net_stub.excel = EMPTY_CAPE_DF
 
-            cape = shiller_client.get_latest_cape(use_cache=False)
-            assert cape is None
+        cape = shiller_client.get_latest_cape(use_cache=False)
+        assert cape is None
 
     def test_cache_path_generation(self, shiller_client):
         """Test cache file path generation."""
@@ -172,6 +163,7 @@ class TestShillerDataClient:
         assert cache_path.parent == shiller_client.cache_dir
         assert cache_path.name == 'cape_latest.txt'
 
+    @pytest.mark.io
     def test_save_and_load_cache(self, shiller_client):
         """Test cache save and load functionality."""
         test_cape = 32.45
@@ -184,11 +176,13 @@ class TestShillerDataClient:
 
         assert loaded_cape == test_cape
 
+    @pytest.mark.io
     def test_load_cache_file_not_exists(self, shiller_client):
         """Test loading cache when file doesn't exist."""
         loaded_cape = shiller_client._load_from_cache(ttl_days=7)
         assert loaded_cape is None
 
+    @pytest.mark.io
     def test_load_cache_corrupted_file(self, shiller_client):
         """Test loading corrupted cache file."""
         # Create corrupted cache file
@@ -199,42 +193,22 @@ class TestShillerDataClient:
         loaded_cape = shiller_client._load_from_cache(ttl_days=7)
         assert loaded_cape is None
 
-    def test_alternative_cape_column_names(self, shiller_client):
+    def test_alternative_cape_column_names(self, shiller_client, net_stub):
         """Test that alternative CAPE column names are recognized."""
-        mock_response = Mock()
-        mock_response.content = b'mock excel content'
-        mock_response.raise_for_status = Mock()
-
         # Try 'Cyclically Adjusted PE Ratio' column name
-        alt_data = pd.DataFrame({
-            'Date': pd.date_range('2020-01', periods=12, freq='MS'),
-            'Cyclically Adjusted PE Ratio': [30.0 + i*0.5 for i in range(12)]
-        })
-
-        with patch('requests.get', return_value=mock_response), \
-             patch('pandas.read_excel', return_value=alt_data):
+        net_stub.excel = ALT_CAPE_DF
 
-            cape = shiller_client.get_latest_cape(use_cache=False)
-            assert cape == 35.5  # Should find the alternative column name
+        cape = shiller_client.get_latest_cape(use_cache=False)
+        assert cape == 35.5  # Should find the alternative column name
 
-    def test_fetch_with_timeout(self, shiller_client):
+    def test_fetch_with_timeout(self, shiller_client, net_stub):
         """Test that timeout is set for requests."""
-        mock_response = Mock()
-        mock_response.content = b'mock excel content'
-        mock_response.raise_for_status = Mock()
-
-        mock_excel_data = pd.DataFrame({
-            'Date': pd.date_range('2020-01', periods=12, freq='MS'),
-            'CAPE': [30.0 + i*0.5 for i in range(12)]
-        })
-
-        with patch('requests.get', return_value=mock_response) as mock_get, \
-             patch('pandas.read_excel', return_value=mock_excel_data):
+        net_stub.excel = CAPE_DF
 
-            shiller_client.get_latest_cape(use_cache=False)
+        shiller_client.get_latest_cape(use_cache=False)
 
-            # Verify timeout was passed to requests.get
-            mock_get.assert_called_once()
-            call_kwargs = mock_get.call_args[1]
-            assert 'timeout' in call_kwargs
-            assert call_kwargs['timeout'] == 30
+        # Verify timeout was passed to requests.get
+        assert len(net_stub.get_calls) == 1
+        _, call_kwargs = net_stub.get_calls[0]
+        assert 'timeout' in call_kwargs
+        assert call_kwargs['timeout'] == 30